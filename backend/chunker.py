@@ -1,214 +1,601 @@
-# =======================================================================
-# i3T4AN (Ethan Blair)
-# Project:      Vector Knowledge Base
-# File:         Text chunking logic for documents
-# =======================================================================
-
-import logging
-import re
-import ast
-from typing import List, Dict, Any, Optional
-from transformers import AutoTokenizer
-
-logger = logging.getLogger(__name__)
-
-class Chunker:
-    # Model's max sequence length - chunks must not exceed this
-    MAX_MODEL_TOKENS = 500  # Leave some buffer below the 512 hard limit
-    
-    def __init__(self, model_name: str = "sentence-transformers/all-mpnet-base-v2", chunk_size: int = 500, chunk_overlap: int = 50):
-        self.chunk_size = chunk_size
-        self.chunk_overlap = chunk_overlap
-        try:
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        except Exception as e:
-            logger.warning(f"Could not load tokenizer for {model_name}, falling back to simple splitting: {e}")
-            self.tokenizer = None
-
-    def _count_tokens(self, text: str) -> int:
-        if self.tokenizer:
-            return len(self.tokenizer.encode(text, add_special_tokens=False))
-        return len(text.split()) # Fallback approximation
-
-    def _split_oversized_text(self, text: str, max_tokens: int = None) -> List[str]:
-        """
-        Split text that exceeds max token limit into smaller pieces.
-        Uses word boundaries to avoid breaking mid-word.
-        """
-        max_tokens = max_tokens or self.MAX_MODEL_TOKENS
-        
-        if self._count_tokens(text) <= max_tokens:
-            return [text]
-        
-        # Split by words and rebuild chunks
-        words = text.split()
-        pieces = []
-        current_piece = []
-        current_tokens = 0
-        
-        for word in words:
-            word_tokens = self._count_tokens(word)
-            if current_tokens + word_tokens > max_tokens and current_piece:
-                pieces.append(' '.join(current_piece))
-                current_piece = []
-                current_tokens = 0
-            current_piece.append(word)
-            current_tokens += word_tokens
-        
-        if current_piece:
-            pieces.append(' '.join(current_piece))
-        
-        return pieces
-
-    def chunk_text(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """
-        Split text into chunks with metadata.
-        Detects if text is code or prose and dispatches accordingly.
-        """
-        if not text:
-            return []
-            
-        metadata = metadata or {}
-        is_code = False
-        
-        # Simple heuristic for code detection if not provided in metadata
-        if metadata.get("language") in ["py", "js", "java", "cpp", "python", "javascript"]:
-            is_code = True
-        
-        if is_code and metadata.get("language") in ["py", "python"]:
-            return self._chunk_python_code(text, metadata)
-        else:
-            return self._chunk_prose(text, metadata)
-
-    def _chunk_prose(self, text: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """
-        Chunk prose text respecting sentence boundaries and lists.
-        """
-        # 1. Split into sentences (simple regex for now, can be improved with nltk)
-        # Look for [.!?] followed by whitespace and an uppercase letter or end of string
-        sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])|(?<=[.!?])\s*$', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        # 2. Split any oversized sentences that exceed model limits
-        processed_sentences = []
-        for sentence in sentences:
-            if self._count_tokens(sentence) > self.MAX_MODEL_TOKENS:
-                # Split this oversized sentence into smaller pieces
-                pieces = self._split_oversized_text(sentence, self.MAX_MODEL_TOKENS)
-                processed_sentences.extend(pieces)
-            else:
-                processed_sentences.append(sentence)
-        sentences = processed_sentences
-        
-        # OPTIMIZATION: Pre-compute token counts for all sentences (cache to avoid redundant tokenization)
-        sentence_token_counts = [self._count_tokens(s) for s in sentences]
-        
-        chunks = []
-        i = 0
-        
-        while i < len(sentences):
-            current_chunk = []
-            current_chunk_tokens = []  # Store token counts for this chunk
-            current_tokens = 0
-            
-            # Build a chunk
-            while i < len(sentences):
-                sentence = sentences[i]
-                tokens = sentence_token_counts[i]  # Use cached token count
-                
-                if current_tokens + tokens > self.chunk_size and current_chunk:
-                    break
-                
-                current_chunk.append(sentence)
-                current_chunk_tokens.append(tokens)  # Cache for overlap calculation
-                current_tokens += tokens
-                i += 1
-            
-            # Save chunk
-            chunks.append({
-                'text': ' '.join(current_chunk),
-                'chunk_index': len(chunks),
-                'token_count': current_tokens,
-                'metadata': metadata.copy()
-            })
-            
-            # OVERLAP: Backtrack to include last N tokens in next chunk
-            if i < len(sentences):
-                overlap_tokens = 0
-                overlap_sentences = 0
-                
-                for j in range(len(current_chunk) - 1, -1, -1):
-                    overlap_tokens += current_chunk_tokens[j]  # Use cached token count (no re-tokenization!)
-                    
-                    # Prevent infinite loop: ensure at least one sentence advances
-                    if overlap_sentences + 1 >= len(current_chunk):
-                        break
-                        
-                    overlap_sentences += 1
-                    if overlap_tokens >= self.chunk_overlap:
-                        break
-                
-                # Rewind i to repeat these sentences in next chunk
-                i -= overlap_sentences
-        
-        return chunks
-
-    def _chunk_python_code(self, text: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """
-        Chunk Python code respecting class and function boundaries using AST.
-        """
-        chunks = []
-        try:
-            tree = ast.parse(text)
-            lines = text.splitlines()
-            
-            # We will traverse top-level nodes
-            current_chunk_lines = []
-            current_chunk_token_count = 0
-            
-            for node in tree.body:
-                # Get source segment for this node
-                if hasattr(node, 'lineno') and hasattr(node, 'end_lineno'):
-                    start = node.lineno - 1
-                    end = node.end_lineno
-                    node_lines = lines[start:end]
-                    node_text = "\n".join(node_lines)
-                    node_tokens = self._count_tokens(node_text)
-                    
-                    if current_chunk_token_count + node_tokens > self.chunk_size:
-                        if current_chunk_lines:
-                            chunk_text = "\n".join(current_chunk_lines)
-                            chunks.append({
-                                "text": chunk_text,
-                                "chunk_index": len(chunks),
-                                "token_count": current_chunk_token_count,
-                                "metadata": metadata.copy()
-                            })
-                            current_chunk_lines = []
-                            current_chunk_token_count = 0
-                    
-                    current_chunk_lines.extend(node_lines)
-                    current_chunk_token_count += node_tokens
-                else:
-                    # Skip nodes without line info (rare edge case)
-                    pass
-            
-            # Add remaining
-            if current_chunk_lines:
-                chunk_text = "\n".join(current_chunk_lines)
-                chunks.append({
-                    "text": chunk_text,
-                    "chunk_index": len(chunks),
-                    "token_count": current_chunk_token_count,
-                    "metadata": metadata.copy()
-                })
-                
-        except SyntaxError:
-            # Fallback to prose chunking if AST parsing fails
-            logger.warning("AST parsing failed (SyntaxError), falling back to prose chunking")
-            return self._chunk_prose(text, metadata)
-            
-        return chunks
-
-# Global instance
-chunker = Chunker()
+# =======================================================================
+# i3T4AN (Ethan Blair)
+# Project:      Vector Knowledge Base
+# File:         Text chunking logic for documents
+# =======================================================================
+
+import logging
+import os
+import re
+import ast
+from functools import cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Iterator
+
+# Let the Rust tokenizer parallelize batched encodes (set before transformers import)
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+import numpy as np
+
+# Numba is pulled in by umap-learn; treat it as optional so the chunker
+# still works in environments without it
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+# Sentence boundary: [.!?] followed by whitespace and an uppercase letter, or end of string.
+# Compiled once at import so the hot path skips the re-cache lookup per call.
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])|(?<=[.!?])\s*$')
+
+
+def _compute_chunk_boundaries(prefix, chunk_size, chunk_overlap):
+    """
+    Compute per-chunk sentence index ranges from an int64 token-count
+    prefix-sum array (prefix[k] = total tokens in sentences[:k]).
+
+    Pure integer arithmetic - kept free of Python objects so Numba can
+    compile it. Returns (starts, ends) index arrays; chunk k covers
+    sentences[starts[k]:ends[k]]. Chunk ends and overlap rewinds are
+    found by binary search on the prefix array - O(log N) per chunk
+    instead of a linear token accumulation. Semantics match the old
+    sequential loop: every chunk holds at least one sentence and the
+    overlap rewind always keeps a net advance of at least one.
+    """
+    n = prefix.shape[0] - 1
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    n_chunks = 0
+    i = 0
+
+    while i < n:
+        start = i
+
+        # Last sentence index that still fits within chunk_size tokens
+        end = np.searchsorted(prefix, prefix[start] + chunk_size, side='right') - 1
+        if end <= start:
+            end = start + 1  # A single oversized sentence still forms a chunk
+
+        starts[n_chunks] = start
+        ends[n_chunks] = end
+        n_chunks += 1
+
+        i = end
+        if end < n:
+            # OVERLAP: rewind the smallest sentence tail holding at least
+            # chunk_overlap tokens (at least one sentence, and never the
+            # whole chunk, so the next chunk advances)
+            idx = np.searchsorted(prefix, prefix[end] - chunk_overlap, side='right') - 1
+            rewind = end - idx
+            if rewind < 1:
+                rewind = 1
+            if rewind > end - start - 1:
+                rewind = end - start - 1
+            i = end - rewind
+
+    return starts[:n_chunks], ends[:n_chunks]
+
+
+def _compute_greedy_boundaries(prefix, chunk_size):
+    """
+    No-overlap variant of _compute_chunk_boundaries used for code
+    chunking: each chunk is the longest run of nodes whose token total
+    stays within chunk_size, always at least one node per chunk.
+    """
+    n = prefix.shape[0] - 1
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    n_chunks = 0
+    i = 0
+
+    while i < n:
+        end = np.searchsorted(prefix, prefix[i] + chunk_size, side='right') - 1
+        if end <= i:
+            end = i + 1  # A single oversized node still forms a chunk
+        starts[n_chunks] = i
+        ends[n_chunks] = end
+        n_chunks += 1
+        i = end
+
+    return starts[:n_chunks], ends[:n_chunks]
+
+
+if njit is not None:
+    _compute_chunk_boundaries = njit(cache=True)(_compute_chunk_boundaries)
+    _compute_greedy_boundaries = njit(cache=True)(_compute_greedy_boundaries)
+
+
+class Chunker:
+    # Model's max sequence length - chunks must not exceed this
+    MAX_MODEL_TOKENS = 500  # Leave some buffer below the 512 hard limit
+
+    # Max entries in the token-count memo cache (bounds memory on huge corpora)
+    TOKEN_CACHE_MAX = 100_000
+
+    # Sentences buffered per streaming boundary pass in _chunk_prose
+    STREAM_BLOCK_SENTENCES = 512
+
+    # Rough tokens-per-line for Python source, used to spot obviously
+    # oversized AST nodes without tokenizing them first
+    AVG_TOKENS_PER_LINE = 8
+
+    def __init__(self, model_name: str = "sentence-transformers/all-mpnet-base-v2", chunk_size: int = 500, chunk_overlap: int = 50):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        # Memoize token counts - identical strings (repeated sentences, words,
+        # code prefixes) tokenize identically, so skip the tokenizer on repeats
+        self._token_count_cache: Dict[str, int] = {}
+        try:
+            # Imported here so merely importing chunker doesn't drag in the
+            # full transformers stack (torch, safetensors, huggingface_hub)
+            from transformers import AutoTokenizer
+
+            # use_fast=True guarantees the Rust-backed tokenizer (batched encodes, no Python BPE)
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+            # Warm up: the first encode JIT-loads merges/normalizers, so pay
+            # that one-time cost here instead of on the first user request
+            self.tokenizer.encode("warmup", add_special_tokens=False)
+            # The raw Rust tokenizer - counting through it skips the HF
+            # Python wrapper (padding/truncation bookkeeping we never use)
+            self._backend_tokenizer = getattr(self.tokenizer, "backend_tokenizer", None)
+        except Exception as e:
+            logger.warning(f"Could not load tokenizer for {model_name}, falling back to simple splitting: {e}")
+            self.tokenizer = None
+            self._backend_tokenizer = None
+
+    def _cache_token_count(self, text: str, count: int) -> None:
+        """Store a token count in the memo cache (bounded to TOKEN_CACHE_MAX entries)."""
+        if len(self._token_count_cache) < self.TOKEN_CACHE_MAX:
+            self._token_count_cache[text] = count
+
+    def _approx_token_count(self, text: str) -> int:
+        """
+        Cheap character-based token estimate for very short strings.
+        WordPiece yields roughly one token per ~3-4 ASCII chars, so this is
+        a usable upper bound where exact counts don't matter (e.g. packing
+        words into pieces well under the model limit).
+        """
+        return max(1, len(text) // 3)
+
+    def _count_tokens(self, text: str, approx: bool = False) -> int:
+        if approx and len(text) < 8:
+            return self._approx_token_count(text)
+        cached = self._token_count_cache.get(text)
+        if cached is not None:
+            return cached
+        if self._backend_tokenizer is not None:
+            count = len(self._backend_tokenizer.encode(text, add_special_tokens=False).ids)
+        elif self.tokenizer:
+            count = len(self.tokenizer.encode(text, add_special_tokens=False))
+        else:
+            count = len(text.split()) # Fallback approximation
+        self._cache_token_count(text, count)
+        return count
+
+    def _count_tokens_batch(self, texts: List[str], approx: bool = False) -> List[int]:
+        """
+        Count tokens for many strings in a single tokenizer call.
+        One batched call into the Rust tokenizer is far cheaper than
+        crossing the Python/Rust boundary once per string.
+        Counts are memoized, so only cache misses hit the tokenizer.
+        With approx=True, very short strings use the character heuristic
+        instead of the tokenizer (estimates are not cached).
+        """
+        if not texts:
+            return []
+        if approx:
+            counts = [
+                self._approx_token_count(t) if len(t) < 8 else self._token_count_cache.get(t)
+                for t in texts
+            ]
+        else:
+            counts = [self._token_count_cache.get(t) for t in texts]
+        miss_indices = [i for i, c in enumerate(counts) if c is None]
+        if miss_indices:
+            misses = [texts[i] for i in miss_indices]
+            if self._backend_tokenizer is not None:
+                encodings = self._backend_tokenizer.encode_batch(misses, add_special_tokens=False)
+                miss_counts = [len(enc.ids) for enc in encodings]
+            elif self.tokenizer:
+                # Only lengths are needed - skip allocating the auxiliary arrays
+                encodings = self.tokenizer(
+                    misses,
+                    add_special_tokens=False,
+                    return_attention_mask=False,
+                    return_token_type_ids=False
+                )
+                miss_counts = [len(ids) for ids in encodings["input_ids"]]
+            else:
+                miss_counts = [len(t.split()) for t in misses] # Fallback approximation
+            for i, count in zip(miss_indices, miss_counts):
+                counts[i] = count
+                self._cache_token_count(texts[i], count)
+        return counts
+
+    def _token_offsets(self, text: str) -> Optional[List[tuple]]:
+        """
+        Character offsets for every token of text from one tokenizer call,
+        or None when no tokenizer is loaded. A two-pointer sweep over these
+        offsets gives per-span token counts with zero extra tokenizer calls
+        and zero substring allocations.
+        """
+        if not self.tokenizer:
+            return None
+        encoding = self.tokenizer(
+            text,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            return_attention_mask=False,
+            return_token_type_ids=False
+        )
+        return encoding["offset_mapping"]
+
+    def _split_oversized_text(self, text: str, max_tokens: int = None) -> List[str]:
+        """
+        Split text that exceeds max token limit into smaller pieces.
+        Tokenizes the text once with character offsets and cuts max_tokens-
+        sized windows, snapping each cut back to whitespace so words stay
+        intact - one tokenizer call instead of one per word.
+        """
+        max_tokens = max_tokens or self.MAX_MODEL_TOKENS
+
+        offsets = self._token_offsets(text)
+        if offsets is None:
+            return self._split_oversized_by_words(text, max_tokens)
+
+        n_tokens = len(offsets)
+
+        if n_tokens <= max_tokens:
+            return [text]
+
+        pieces = []
+        t = 0
+        while t < n_tokens:
+            end_t = min(t + max_tokens, n_tokens)
+            start_char = offsets[t][0]
+            end_char = offsets[end_t - 1][1]
+
+            # If the next token continues the same word (no whitespace in
+            # between), snap the cut back to the last whitespace in the
+            # window so words stay whole; a single window-sized word stays
+            # mid-cut
+            if end_t < n_tokens and offsets[end_t][0] == end_char:
+                cut = end_char
+                while cut > start_char and not text[cut - 1].isspace():
+                    cut -= 1
+                if cut > start_char:
+                    end_char = cut
+
+            piece = text[start_char:end_char].strip()
+            if piece:
+                pieces.append(piece)
+
+            # Advance to the first token at or past the cut
+            while t < n_tokens and offsets[t][0] < end_char:
+                t += 1
+
+        return pieces
+
+    def _split_oversized_by_words(self, text: str, max_tokens: int) -> List[str]:
+        """Word-packing fallback for when no tokenizer is loaded."""
+        if self._count_tokens(text) <= max_tokens:
+            return [text]
+
+        # Split by words and rebuild chunks
+        words = text.split()
+        # Approximate counts suffice here: pieces are packed against the
+        # model limit, and the estimate is an upper bound for short words
+        word_token_counts = self._count_tokens_batch(words, approx=True)
+        pieces = []
+        piece_start = 0
+        current_tokens = 0
+
+        for idx, word_tokens in enumerate(word_token_counts):
+            if current_tokens + word_tokens > max_tokens and idx > piece_start:
+                pieces.append(' '.join(words[piece_start:idx]))
+                piece_start = idx
+                current_tokens = 0
+            current_tokens += word_tokens
+
+        if piece_start < len(words):
+            pieces.append(' '.join(words[piece_start:]))
+
+        return pieces
+
+    def chunk_text(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Split text into chunks with metadata.
+        Detects if text is code or prose and dispatches accordingly.
+        """
+        return list(self.chunk_text_stream(text, metadata))
+
+    def chunk_text_stream(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield chunks of text with metadata. Prose is processed in
+        sentence blocks with the finished chunks streamed out as soon as
+        their boundaries are settled, keeping peak memory at O(block)
+        instead of O(document) for large inputs.
+        """
+        if not text:
+            return
+
+        # Chunks are read-only downstream, so share one zero-copy view of the
+        # metadata across all chunks instead of dict-copying per chunk
+        metadata = MappingProxyType(metadata or {})
+        is_code = False
+
+        # Simple heuristic for code detection if not provided in metadata
+        if metadata.get("language") in ["py", "js", "java", "cpp", "python", "javascript"]:
+            is_code = True
+
+        if is_code and metadata.get("language") in ["py", "python"]:
+            yield from self._chunk_python_code(text, metadata)
+        else:
+            yield from self._chunk_prose(text, metadata)
+
+    @staticmethod
+    def _iter_sentence_spans(text: str) -> Iterator[tuple]:
+        """
+        Yield whitespace-trimmed (start, end) character spans of sentences
+        as the boundary regex matches them (simple regex for now, can be
+        improved with nltk). Trimming happens in offset space, so no
+        substring is allocated for empty or whitespace-only pieces.
+        """
+        def raw_spans():
+            prev_end = 0
+            for match in _SENTENCE_SPLIT_RE.finditer(text):
+                yield prev_end, match.start()
+                prev_end = match.end()
+            if prev_end < len(text):
+                yield prev_end, len(text)
+
+        for a, b in raw_spans():
+            while a < b and text[a].isspace():
+                a += 1
+            while b > a and text[b - 1].isspace():
+                b -= 1
+            if a < b:
+                yield a, b
+
+    def _chunk_prose(self, text: str, metadata: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Chunk prose text respecting sentence boundaries and lists.
+
+        Streaming pipeline: sentences accumulate in blocks; after each
+        block the boundary kernel runs and every chunk except the last
+        (which may still grow) is emitted. The last chunk's sentences
+        carry over into the next block, so boundaries and overlap are
+        identical to a single whole-document pass - the greedy kernel is
+        deterministic given a chunk's start sentence.
+        """
+        # One whole-document tokenization; per-sentence counts come from a
+        # two-pointer sweep over the token character offsets
+        offsets = self._token_offsets(text)
+        n_tokens = len(offsets) if offsets is not None else 0
+        t = 0
+
+        chunk_index = 0
+        sentences: List[str] = []
+        sentence_token_counts: List[int] = []
+        new_since_pass = 0
+
+        for a, b in self._iter_sentence_spans(text):
+            if offsets is not None:
+                while t < n_tokens and offsets[t][0] < a:
+                    t += 1
+                token_count = 0
+                while t < n_tokens and offsets[t][0] < b:
+                    token_count += 1
+                    t += 1
+            else:
+                token_count = len(text[a:b].split()) # Fallback approximation
+
+            if token_count > self.MAX_MODEL_TOKENS:
+                # Split this oversized sentence into smaller pieces
+                pieces = self._split_oversized_text(text[a:b], self.MAX_MODEL_TOKENS)
+                sentences.extend(pieces)
+                sentence_token_counts.extend(self._count_tokens_batch(pieces))
+                new_since_pass += len(pieces)
+            else:
+                sentences.append(text[a:b])
+                sentence_token_counts.append(token_count)
+                new_since_pass += 1
+
+            if new_since_pass >= self.STREAM_BLOCK_SENTENCES:
+                new_since_pass = 0
+                counts = np.asarray(sentence_token_counts, dtype=np.int64)
+                prefix = np.zeros(len(counts) + 1, dtype=np.int64)
+                np.cumsum(counts, out=prefix[1:])
+                starts, ends = _compute_chunk_boundaries(prefix, self.chunk_size, self.chunk_overlap)
+
+                # Emit all settled chunks; the final boundary may extend as
+                # more sentences arrive, so its sentences become the carry
+                for k in range(len(starts) - 1):
+                    start, end = starts[k], ends[k]
+                    yield {
+                        'text': ' '.join(sentences[start:end]),
+                        'chunk_index': chunk_index,
+                        'token_count': int(prefix[end] - prefix[start]),
+                        'metadata': metadata
+                    }
+                    chunk_index += 1
+                carry_from = int(starts[-1])
+                sentences = sentences[carry_from:]
+                sentence_token_counts = sentence_token_counts[carry_from:]
+
+        # Final pass: everything left is settled
+        if sentences:
+            counts = np.asarray(sentence_token_counts, dtype=np.int64)
+            prefix = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=prefix[1:])
+            starts, ends = _compute_chunk_boundaries(prefix, self.chunk_size, self.chunk_overlap)
+
+            for start, end in zip(starts, ends):
+                yield {
+                    'text': ' '.join(sentences[start:end]),
+                    'chunk_index': chunk_index,
+                    'token_count': int(prefix[end] - prefix[start]),
+                    'metadata': metadata
+                }
+                chunk_index += 1
+
+    def _collect_code_segments(self, node, segments: List[tuple]) -> None:
+        """
+        Append (start_line, end_line) ranges covering `node` to segments.
+
+        A node whose line-count estimate fits a chunk is kept whole. An
+        obviously oversized node (e.g. a 2000-token class) is descended
+        into instead of being tokenized just to learn it overflows:
+        its children are collected recursively at their own granularity,
+        and header/decorator/comment lines between children are emitted
+        as their own ranges so no source line is lost.
+        """
+        est_tokens = (node.end_lineno - node.lineno + 1) * self.AVG_TOKENS_PER_LINE
+
+        body = getattr(node, 'body', None)
+        children = []
+        if est_tokens > self.chunk_size * 1.5 and isinstance(body, list):
+            children = [
+                child for child in body
+                if hasattr(child, 'lineno') and hasattr(child, 'end_lineno')
+            ]
+
+        if not children:
+            segments.append((node.lineno - 1, node.end_lineno))
+            return
+
+        cursor = node.lineno - 1
+        for child in children:
+            child_start = child.lineno - 1
+            if child_start > cursor:
+                segments.append((cursor, child_start))
+            self._collect_code_segments(child, segments)
+            cursor = max(cursor, child.end_lineno)
+        if cursor < node.end_lineno:
+            segments.append((cursor, node.end_lineno))
+
+    def _chunk_python_code(self, text: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Chunk Python code respecting class and function boundaries using AST.
+        """
+        chunks = []
+        try:
+            tree = ast.parse(text)
+
+            # Byte offsets of each line start - node source is sliced straight
+            # out of `text` instead of materializing a line list and re-joining
+            line_starts = [0]
+            for line in text.split('\n'):
+                line_starts.append(line_starts[-1] + len(line) + 1)
+
+            # Collect chunkable line ranges, descending into nodes that are
+            # obviously bigger than a chunk (e.g. large classes split at
+            # method granularity), then keep them in SoA int arrays
+            segments: List[tuple] = []
+            for node in tree.body:
+                # Skip nodes without line info (rare edge case)
+                if hasattr(node, 'lineno') and hasattr(node, 'end_lineno'):
+                    self._collect_code_segments(node, segments)
+            node_starts = np.fromiter((a for a, _ in segments), dtype=np.int64, count=len(segments))
+            node_ends = np.fromiter((b for _, b in segments), dtype=np.int64, count=len(segments))
+            node_texts = [
+                text[line_starts[a]:line_starts[b] - 1]
+                for a, b in zip(node_starts, node_ends)
+            ]
+
+            # Count tokens in one batched tokenizer call instead of one per
+            # node, then find chunk boundaries with the same prefix-sum
+            # binary search used for prose
+            node_token_counts = self._count_tokens_batch(node_texts)
+            counts = np.asarray(node_token_counts, dtype=np.int64)
+            prefix = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=prefix[1:])
+            starts, ends = _compute_greedy_boundaries(prefix, self.chunk_size)
+
+            for start, end in zip(starts, ends):
+                chunks.append({
+                    "text": "\n".join(node_texts[start:end]),
+                    "chunk_index": len(chunks),
+                    "token_count": int(prefix[end] - prefix[start]),
+                    "metadata": metadata
+                })
+                
+        except SyntaxError:
+            # Fallback to prose chunking if AST parsing fails
+            logger.warning("AST parsing failed (SyntaxError), falling back to prose chunking")
+            return list(self._chunk_prose(text, metadata))
+            
+        return chunks
+
+@cache
+def _build_chunker() -> Chunker:
+    """Construct the shared Chunker (tokenizer load + warm-up) exactly once."""
+    return Chunker()
+
+
+def __getattr__(name: str):
+    # PEP 562, matching config.settings: build the global chunker (HF
+    # tokenizer download/load plus warm-up encode) on first access, so
+    # bare `import chunker` — extraction workers, scripts — stays cheap
+    if name == "chunker":
+        return _build_chunker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Per-process Chunker used by chunk_documents workers (set by the pool initializer)
+_worker_chunker: Optional[Chunker] = None
+
+
+def _init_chunker_worker(model_name: str, chunk_size: int, chunk_overlap: int) -> None:
+    """Build one Chunker (with its own tokenizer) per worker process."""
+    global _worker_chunker
+    _worker_chunker = Chunker(model_name=model_name, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def _chunk_one_document(args) -> List[Dict[str, Any]]:
+    text, metadata = args
+    chunks = _worker_chunker.chunk_text(text, metadata)
+    # The shared metadata view is not picklable - materialize it once for
+    # the trip back to the parent process
+    if chunks:
+        plain_metadata = dict(chunks[0]['metadata'])
+        for chunk in chunks:
+            chunk['metadata'] = plain_metadata
+    return chunks
+
+
+def chunk_documents(
+    texts: List[str],
+    metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+    n_workers: Optional[int] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Chunk many independent documents in parallel.
+
+    Each worker process constructs its own Chunker, so the Rust tokenizer
+    pools never contend across documents. Returns one chunk list per input
+    document, in input order. Small batches (or n_workers=1) just use the
+    shared chunker instance serially.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if metadatas is None:
+        metadatas = [None] * len(texts)
+    if len(metadatas) != len(texts):
+        raise ValueError("texts and metadatas must have the same length")
+
+    n_workers = n_workers or os.cpu_count() or 1
+    n_workers = min(n_workers, len(texts))
+
+    shared = _build_chunker()
+    if n_workers <= 1:
+        return [shared.chunk_text(text, metadata) for text, metadata in zip(texts, metadatas)]
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        initializer=_init_chunker_worker,
+        initargs=("sentence-transformers/all-mpnet-base-v2", shared.chunk_size, shared.chunk_overlap)
+    ) as pool:
+        return list(pool.map(_chunk_one_document, zip(texts, metadatas)))
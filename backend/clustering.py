@@ -5,7 +5,6 @@
 # =======================================================================
 
 import numpy as np
-import hdbscan
 from typing import List
 import logging
 
@@ -39,6 +38,9 @@ class ClusteringService:
         Returns:
             List of cluster IDs (-1 indicates noise)
         """
+        # Imported lazily (like TfidfVectorizer below) so module import stays cheap
+        import hdbscan
+
         if not embeddings:
             logger.warning("No embeddings provided for clustering")
             return []
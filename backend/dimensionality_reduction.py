@@ -7,14 +7,88 @@
 import numpy as np
 import logging
 from typing import List, Dict, Any, Optional, Union, Tuple
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
 import pickle
 import os
+from config import settings
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba ships with umap-learn
+    njit = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def _pca_project(x, comp, mean, out):
+    """
+    Fused (x - mean) @ comp.T for one vector. At k=3, D=768 the matmul is
+    ~2.3k flops, so BLAS dispatch and thread handoff dominate a GEMV
+    call; the compiled loop stays under a microsecond per query.
+    """
+    for i in range(comp.shape[0]):
+        acc = np.float32(0.0)
+        for j in range(comp.shape[1]):
+            acc += (x[j] - mean[j]) * comp[i, j]
+        out[i] = acc
+
+
+if njit is not None:
+    _pca_project = njit(cache=True, fastmath=True, boundscheck=False)(_pca_project)
+else:
+    _pca_project = None
+
+
+def _gram_matrix(X: np.ndarray) -> np.ndarray:
+    """
+    Compute X.T @ X via the BLAS SYRK routine, which only fills one
+    triangle of the symmetric result (~2x less work than a plain GEMM).
+    Falls back to the ordinary matmul if the BLAS handle is unavailable.
+    """
+    try:
+        from scipy.linalg import get_blas_funcs
+        syrk = get_blas_funcs('syrk', (X,))
+        upper = syrk(1.0, X, trans=1)
+        return upper + np.triu(upper, 1).T
+    except Exception:
+        return X.T @ X
+
+
+class _GramPCA:
+    """
+    PCA computed from the D x D Gram matrix instead of an SVD of the
+    N x D data matrix. For our workload D is fixed at 768 while N grows
+    with the corpus, so one SYRK (O(N*D^2)) plus a D^3 eigh is much
+    cheaper than the N-bound SVD and never copies X for mean-centering
+    (the mean is subtracted from the Gram analytically).
+
+    Duck-types the slice of the sklearn PCA interface the reducer uses
+    (fit_transform / transform / components_ / mean_ / n_components_),
+    so save_model/load_model pickle it like any other transformer.
+    """
+
+    def __init__(self, n_components: int):
+        self.n_components = n_components
+        self.n_components_ = n_components
+        self.components_ = None
+        self.mean_ = None
+
+    def fit_transform(self, X: np.ndarray) -> np.ndarray:
+        n_samples = X.shape[0]
+        self.mean_ = X.mean(axis=0)
+        # G = (X - mu).T @ (X - mu), expanded so X is never centered in place
+        G = _gram_matrix(X) - n_samples * np.outer(self.mean_, self.mean_)
+        # eigh returns eigenvalues ascending; take the top-k eigenvectors
+        _, V = np.linalg.eigh(G)
+        self.components_ = V[:, -self.n_components_:][:, ::-1].T
+        return (X - self.mean_) @ self.components_.T
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return (X - self.mean_) @ self.components_.T
+
+
 class DimensionalityReducer:
     """
     Handles dimensionality reduction of high-dimensional embeddings to 3D
@@ -33,6 +107,13 @@ class DimensionalityReducer:
         self.n_components = n_components
         self.transformer = None
         self.is_fitted = False
+        # Projection cached as a plain (V, mu) pair after a PCA fit so
+        # transform() is one matmul with no sklearn dispatch overhead
+        self._components = None
+        self._mean = None
+        # Rows held back by partial_fit until a full IncrementalPCA
+        # batch (>= n_components samples) has accumulated
+        self._pending = None
         
         if self.method not in ['pca', 'umap']:
             logger.warning(f"Unknown method '{method}', defaulting to 'pca'")
@@ -46,22 +127,73 @@ class DimensionalityReducer:
             except ImportError:
                 logger.warning("umap-learn not installed. Falling back to PCA.")
                 self.method = 'pca'
+        
+        # When embeddings are already produced on CUDA, keep the reduction
+        # on-device with cuML instead of copying back through CPU sklearn
+        self._cuml = None
+        self._cupy = None
+        if settings.DEVICE == "cuda":
+            try:
+                import cuml
+                import cupy
+                self._cuml = cuml
+                self._cupy = cupy
+                logger.info("cuML available; dimensionality reduction will run on GPU")
+            except ImportError:
+                logger.info("cuML not installed; using CPU reducers")
 
-    def fit_transform(self, embeddings: List[List[float]]) -> np.ndarray:
+    def _make_pca(self, n_components: int) -> PCA:
+        """
+        Build a PCA configured for this workload: only a handful of
+        components are ever needed from 768-dim embeddings, so the
+        randomized solver (Halko's range finder, O(N*D*k)) beats the
+        full SVD (O(N*D*min(N,D))) with identical top-k quality.
+        """
+        return PCA(
+            n_components=n_components,
+            svd_solver='randomized',
+            random_state=42,
+            n_oversamples=5,
+            power_iteration_normalizer='LU'
+        )
+
+    def _cache_projection(self):
+        """
+        Pull (components_, mean_) out of a fitted PCA-style transformer so
+        transform() can run as a bare matmul. UMAP has no linear
+        projection, so the cache stays empty and transform() falls back
+        to the fitted transformer.
+        """
+        try:
+            if hasattr(self.transformer, 'components_') and self.transformer.components_ is not None:
+                self._components = np.asarray(self.transformer.components_, dtype=np.float32)
+                self._mean = np.asarray(self.transformer.mean_, dtype=np.float32)
+            else:
+                self._components = None
+                self._mean = None
+        except Exception:
+            # e.g. device arrays that don't coerce via np.asarray; the
+            # fitted transformer itself still handles transform()
+            self._components = None
+            self._mean = None
+
+    def fit_transform(self, embeddings: Union[np.ndarray, List[List[float]]]) -> np.ndarray:
         """
         Fit the model on the provided embeddings and return the 3D coordinates.
         
         Args:
-            embeddings: List of high-dimensional embedding vectors
+            embeddings: (N, D) array or list of high-dimensional embedding vectors
             
         Returns:
             Numpy array of shape (n_samples, 3) containing 3D coordinates
         """
-        if not embeddings:
+        if embeddings is None or len(embeddings) == 0:
             logger.warning("No embeddings provided to fit_transform")
             return np.array([])
             
-        X = np.array(embeddings)
+        # float32 halves memory bandwidth through the fit and is a no-copy
+        # view when the embedding service already handed us an fp32 array
+        X = np.asarray(embeddings, dtype=np.float32)
         
         # Handle case with too few samples
         n_samples = X.shape[0]
@@ -75,27 +207,45 @@ class DimensionalityReducer:
             actual_components = min(n_samples, self.n_components)
             
             if self.method == 'pca':
-                temp_transformer = PCA(n_components=actual_components)
+                temp_transformer = self._make_pca(actual_components)
                 reduced = temp_transformer.fit_transform(X)
                 self.transformer = temp_transformer # Save it even if partial
             else:
                 # UMAP needs more samples usually, fallback to PCA logic for tiny datasets
-                temp_transformer = PCA(n_components=actual_components)
+                temp_transformer = self._make_pca(actual_components)
                 reduced = temp_transformer.fit_transform(X)
                 self.transformer = temp_transformer
                 
             self.is_fitted = True
+            self._cache_projection()
             
-            # Pad columns if needed to reach n_components
+            # Pad columns if needed to reach n_components: write into a
+            # preallocated output instead of hstack's allocate-and-copy
             if actual_components < self.n_components:
-                padding = np.zeros((n_samples, self.n_components - actual_components))
-                reduced = np.hstack((reduced, padding))
+                out = np.zeros((n_samples, self.n_components), dtype=np.float32)
+                out[:, :actual_components] = reduced
+                return out
                 
             return reduced
 
         try:
-            if self.method == 'pca':
-                self.transformer = PCA(n_components=self.n_components)
+            if self._cuml is not None:
+                Xg = self._cupy.asarray(X)
+                if self.method == 'umap':
+                    self.transformer = self._cuml.UMAP(
+                        n_components=self.n_components,
+                        random_state=42
+                    )
+                else:
+                    self.transformer = self._cuml.PCA(n_components=self.n_components)
+                reduced = self._cupy.asnumpy(self.transformer.fit_transform(Xg))
+            elif self.method == 'pca':
+                if n_samples >= X.shape[1]:
+                    # Tall matrix: the Gram-matrix path does one SYRK over
+                    # the data instead of an N-bound SVD
+                    self.transformer = _GramPCA(self.n_components)
+                else:
+                    self.transformer = self._make_pca(self.n_components)
                 reduced = self.transformer.fit_transform(X)
             elif self.method == 'umap':
                 self.transformer = self._umap_lib.UMAP(
@@ -106,6 +256,7 @@ class DimensionalityReducer:
                 reduced = self.transformer.fit_transform(X)
                 
             self.is_fitted = True
+            self._cache_projection()
             logger.info(f"Successfully fitted {self.method.upper()} model on {n_samples} embeddings")
             return reduced
             
@@ -114,72 +265,174 @@ class DimensionalityReducer:
             # Return zeros as fallback to prevent crash
             return np.zeros((n_samples, self.n_components))
 
-    def transform(self, embedding: List[float]) -> np.ndarray:
+    def partial_fit(self, embeddings: Union[np.ndarray, List[List[float]]]) -> None:
         """
-        Transform a single embedding or list of embeddings using the fitted model.
+        Fold a new batch of embeddings into the projection without
+        refitting on the whole corpus: O(B*D*k) per arriving document
+        instead of O(N*D*k).
+        
+        If no model is fitted yet this grows an IncrementalPCA batch by
+        batch. If a full fit already exists it is kept as-is — the
+        projection drifts slightly as the corpus grows, which is fine for
+        visualization, and a fresh full fit still happens on reset.
+        """
+        if self.method != 'pca':
+            return
+        if embeddings is None or len(embeddings) == 0:
+            return
+        
+        X = np.asarray(embeddings, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        
+        if self.is_fitted and not isinstance(self.transformer, IncrementalPCA):
+            # Existing full fit stays valid for projecting new points
+            return
+        
+        if not isinstance(self.transformer, IncrementalPCA):
+            self.transformer = IncrementalPCA(
+                n_components=self.n_components,
+                batch_size=max(256, self.n_components * 5)
+            )
+        
+        # IncrementalPCA requires n_samples >= n_components on every
+        # partial_fit call, not just the first: buffer undersized batches
+        # (a 1-2 chunk upload, say) and fold them in with the next one
+        if self._pending is not None:
+            X = np.vstack((self._pending, X))
+            self._pending = None
+        if X.shape[0] < self.n_components:
+            self._pending = X
+            return
+
+        try:
+            self.transformer.partial_fit(X)
+            self.is_fitted = True
+            self._cache_projection()
+        except Exception as e:
+            logger.error(f"Error during partial_fit: {str(e)}")
+
+    def transform_batch(self, X: Union[np.ndarray, List[List[float]]]) -> np.ndarray:
+        """
+        Transform a (B, D) batch of embeddings using the fitted model.
+        
+        Callers with several vectors to project should accumulate them
+        and make one call here: B separate transform() calls pay B rounds
+        of Python/sklearn overhead for the same total matmul cost.
         
-        Args:
-            embedding: Single embedding vector or list of vectors
-            
         Returns:
-            Numpy array of shape (n_samples, 3) containing 3D coordinates
+            Numpy array of shape (B, 3) containing 3D coordinates
         """
-        if not self.is_fitted or self.transformer is None:
+        if not self.is_fitted or (self.transformer is None and self._components is None):
             logger.error("Model is not fitted. Call fit_transform first.")
-            # Return zero vector
-            return np.zeros((1, self.n_components))
+            # Return zero vectors
+            return np.zeros((max(len(X), 1), self.n_components))
             
         try:
-            X = np.array(embedding)
-            # Reshape if single sample (1D array)
-            if X.ndim == 1:
-                X = X.reshape(1, -1)
+            X = np.asarray(X, dtype=np.float32)
                 
-            # Handle dimension mismatch if model was fitted on fewer components
-            if hasattr(self.transformer, 'n_components_'):
-                # PCA stores actual components
-                actual_components = self.transformer.n_components_
-            elif hasattr(self.transformer, 'n_components'):
-                actual_components = self.transformer.n_components
+            if self._components is not None:
+                # Cached linear projection: one subtract + one matmul,
+                # no sklearn validation on the hot per-upload path
+                reduced = (X - self._mean) @ self._components.T
             else:
-                actual_components = self.n_components
-                
-            reduced = self.transformer.transform(X)
+                reduced = self.transformer.transform(X)
             
             # Pad if needed (e.g. if we fitted on 1 sample and got 1 component)
             if reduced.shape[1] < self.n_components:
-                padding = np.zeros((reduced.shape[0], self.n_components - reduced.shape[1]))
-                reduced = np.hstack((reduced, padding))
+                out = np.zeros((reduced.shape[0], self.n_components), dtype=np.float32)
+                out[:, :reduced.shape[1]] = reduced
+                return out
                 
             return reduced
             
         except Exception as e:
             logger.error(f"Error during transform: {str(e)}")
-            return np.zeros((1, self.n_components))
+            return np.zeros((max(len(X), 1), self.n_components))
+
+    def transform(self, embedding: List[float]) -> np.ndarray:
+        """
+        Transform a single embedding (or batch) using the fitted model.
+        Thin wrapper over transform_batch for single-vector callers.
+        """
+        X = np.asarray(embedding, dtype=np.float32)
+        # Reshape if single sample (1D array)
+        if X.ndim == 1:
+            if (
+                _pca_project is not None
+                and self.is_fitted
+                and self._components is not None
+                and X.shape[0] == self._components.shape[1]
+                and self._components.shape[0] <= self.n_components
+            ):
+                # Single live query: fused njit kernel beats a BLAS GEMV
+                # at this shape; zero-padding of missing components is
+                # free since the output starts zeroed
+                k = self._components.shape[0]
+                out = np.zeros((1, self.n_components), dtype=np.float32)
+                _pca_project(X, self._components, self._mean, out[0, :k])
+                return out
+            X = X.reshape(1, -1)
+        return self.transform_batch(X)
 
     def save_model(self, filepath: str):
-        """Save the fitted model to disk"""
-        if self.transformer and self.is_fitted:
-            try:
+        """
+        Save the fitted model to disk.
+        
+        Linear (PCA) models persist as a small compressed npz of the
+        float32 (components, mean) pair — a few KB, no pickled sklearn
+        objects and no version-compat risk on load. Non-linear models
+        (UMAP) still fall back to pickle.
+        """
+        if not self.is_fitted:
+            return
+        
+        try:
+            if self._components is not None:
+                with open(filepath, 'wb') as f:
+                    np.savez_compressed(
+                        f,
+                        components=self._components,
+                        mean=self._mean,
+                        method=self.method,
+                        n_components=self.n_components
+                    )
+            elif self.transformer:
                 with open(filepath, 'wb') as f:
                     pickle.dump({
                         'method': self.method,
                         'transformer': self.transformer,
                         'is_fitted': self.is_fitted
                     }, f)
-                logger.info(f"Model saved to {filepath}")
-            except Exception as e:
-                logger.error(f"Failed to save model: {str(e)}")
+            else:
+                return
+            logger.info(f"Model saved to {filepath}")
+        except Exception as e:
+            logger.error(f"Failed to save model: {str(e)}")
 
     def load_model(self, filepath: str):
-        """Load a fitted model from disk"""
+        """Load a fitted model from disk (npz projection or legacy pickle)"""
         if os.path.exists(filepath):
+            try:
+                with np.load(filepath, allow_pickle=False) as data:
+                    self._components = np.asarray(data['components'], dtype=np.float32)
+                    self._mean = np.asarray(data['mean'], dtype=np.float32)
+                    self.method = str(data['method'])
+                    self.n_components = int(data['n_components'])
+                self.transformer = None
+                self.is_fitted = True
+                logger.info(f"Model loaded from {filepath}")
+                return True
+            except Exception:
+                pass  # Not an npz — try the legacy pickle format below
+            
             try:
                 with open(filepath, 'rb') as f:
                     data = pickle.load(f)
                     self.method = data.get('method', 'pca')
                     self.transformer = data.get('transformer')
                     self.is_fitted = data.get('is_fitted', False)
+                self._cache_projection()
                 logger.info(f"Model loaded from {filepath}")
                 return True
             except Exception as e:
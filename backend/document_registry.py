@@ -6,13 +6,17 @@
 
 import json
 import logging
+import mmap
+import orjson
 import os
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from datetime import datetime
 import time
 import asyncio
-from threading import Lock
+from threading import Event, Lock, Thread
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
@@ -27,32 +31,165 @@ class DocumentRegistry:
     
     def __init__(self, registry_path: str = "data/documents.json"):
         self.registry_path = Path(registry_path)
+        # Write-ahead log: mutations append one line here instead of
+        # rewriting the whole snapshot file on every register/unregister
+        self.log_path = self.registry_path.with_suffix('.log')
         self._registry: Dict[str, dict] = {}
+        # Immutable read snapshots, rebuilt after each write: readers get
+        # these without taking the lock (replacing them is one pointer
+        # store, which is atomic under the GIL)
+        self._snapshot: tuple = ()
+        self._index_snapshot = MappingProxyType({})
+        # Secondary index so filename lookups are O(1) instead of a full
+        # registry scan
+        self._by_filename: Dict[str, Set[str]] = defaultdict(set)
         self._lock = Lock()
+        self._log_fh = None
+        self._log_count = 0
+        self._dirty = False
         self._load()
+        # Compactions run on a background daemon thread so request
+        # handlers never wait on a full-snapshot rewrite; the short sleep
+        # in the loop coalesces bursts of triggers into one write
+        self._compact_event = Event()
+        self._saver_thread = Thread(target=self._saver_loop, daemon=True)
+        self._saver_thread.start()
     
     def _load(self) -> None:
-        """Load registry from disk."""
+        """Load the snapshot from disk, then replay the operation log."""
         if self.registry_path.exists():
             try:
-                with open(self.registry_path, 'r') as f:
-                    self._registry = json.load(f)
+                # mmap + orjson: the parser reads straight out of the
+                # page cache with no intermediate read() copy, and pages
+                # fault in lazily as the buffer is consumed
+                with open(self.registry_path, 'rb') as f:
+                    size = os.path.getsize(self.registry_path)
+                    if size == 0:
+                        self._registry = {}
+                    else:
+                        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                        mv = memoryview(mm)
+                        try:
+                            self._registry = orjson.loads(mv)
+                        finally:
+                            mv.release()
+                            mm.close()
                 logger.info(f"Loaded {len(self._registry)} documents from registry")
-            except (json.JSONDecodeError, IOError) as e:
+            except (ValueError, OSError) as e:
                 logger.warning(f"Failed to load registry, starting fresh: {e}")
                 self._registry = {}
         else:
             logger.info("No existing registry found, starting fresh")
             self._registry = {}
+        
+        if self.log_path.exists():
+            try:
+                with open(self.log_path, 'r') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            # Truncated tail from an interrupted write;
+                            # everything before it is still valid
+                            logger.warning("Dropping truncated registry log tail")
+                            break
+                        if record.get("op") == "del":
+                            self._registry.pop(record.get("id"), None)
+                        else:
+                            self._registry[record["id"]] = record.get("meta", {})
+                        self._log_count += 1
+                if self._log_count:
+                    logger.info(f"Replayed {self._log_count} registry log records")
+            except (IOError, KeyError) as e:
+                logger.warning(f"Failed to replay registry log: {e}")
+        
+        for doc_id, meta in self._registry.items():
+            filename = meta.get("filename")
+            if filename:
+                self._by_filename[filename].add(doc_id)
+        self._rebuild_snapshot()
+    
+    def _rebuild_snapshot(self) -> None:
+        """
+        Rebuild the immutable read snapshots from the registry dict.
+        Called with the lock held after every mutation, so readers never
+        observe a partially applied update and never need the lock.
+        """
+        index = dict(self._registry)
+        self._index_snapshot = MappingProxyType(index)
+        self._snapshot = tuple(
+            {
+                "id": doc_id,
+                "filename": meta.get("filename"),
+                "upload_date": meta.get("upload_date"),
+                "total_chunks": meta.get("total_chunks"),
+                "metadata": meta
+            }
+            for doc_id, meta in index.items()
+        )
+    
+    def _append_log(self, record: dict) -> None:
+        """Append a single operation record to the log (O(1) per write)."""
+        try:
+            if self._log_fh is None:
+                self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+                self._log_fh = open(self.log_path, 'a', buffering=1)
+            self._log_fh.write(json.dumps(record, default=str) + "\n")
+            self._log_count += 1
+        except IOError as e:
+            logger.error(f"Failed to append to registry log: {e}")
+            raise
+    
+    def _maybe_compact(self) -> None:
+        """Wake the background saver once the log outgrows the registry."""
+        if self._log_count > max(64, 2 * len(self._registry)):
+            self._compact_event.set()
+    
+    def _saver_loop(self) -> None:
+        """Background writer: debounce compaction triggers, then snapshot."""
+        while True:
+            self._compact_event.wait()
+            self._compact_event.clear()
+            time.sleep(0.1)
+            try:
+                with self._lock:
+                    self._save()
+            except Exception as e:
+                logger.error(f"Background registry save failed: {e}")
+    
+    def flush(self) -> None:
+        """Write any pending state to a snapshot (call on shutdown)."""
+        with self._lock:
+            self._save()
     
     def _save(self) -> None:
-        """Persist registry to disk."""
+        """Persist a full snapshot to disk and truncate the log."""
+        if not self._dirty:
+            return
         try:
             # Ensure directory exists
             self.registry_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.registry_path, 'w') as f:
-                json.dump(self._registry, f, indent=2, default=str)
+            # orjson serializes the dict-of-dicts several times faster than
+            # stdlib json, and writing to a temp file then renaming means a
+            # crash mid-save can never leave a half-written snapshot behind
+            tmp_path = self.registry_path.with_suffix('.tmp')
+            tmp_path.write_bytes(orjson.dumps(
+                self._registry,
+                default=str,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
+            os.replace(tmp_path, self.registry_path)
+            
+            if self._log_fh is not None:
+                self._log_fh.close()
+                self._log_fh = None
+            open(self.log_path, 'w').close()
+            self._log_count = 0
+            self._dirty = False
         except IOError as e:
             logger.error(f"Failed to save registry: {e}")
             raise
@@ -70,13 +207,23 @@ class DocumentRegistry:
             if document_id in self._registry:
                 logger.debug(f"Document {document_id} already registered, updating")
             
-            self._registry[document_id] = {
+            old_entry = self._registry.get(document_id)
+            if old_entry and old_entry.get("filename"):
+                self._by_filename[old_entry["filename"]].discard(document_id)
+            
+            entry = {
                 "filename": metadata.get("filename"),
                 "upload_date": metadata.get("upload_date", time.time()),
                 "total_chunks": metadata.get("total_chunks", 1),
                 "folder_path": metadata.get("folder_path"),
             }
-            self._save()
+            self._registry[document_id] = entry
+            if entry["filename"]:
+                self._by_filename[entry["filename"]].add(document_id)
+            self._dirty = True
+            self._rebuild_snapshot()
+            self._append_log({"op": "put", "id": document_id, "meta": entry})
+            self._maybe_compact()
             logger.debug(f"Registered document: {document_id}")
     
     def unregister(self, document_id: str) -> bool:
@@ -91,8 +238,14 @@ class DocumentRegistry:
         """
         with self._lock:
             if document_id in self._registry:
+                filename = self._registry[document_id].get("filename")
+                if filename:
+                    self._by_filename[filename].discard(document_id)
                 del self._registry[document_id]
-                self._save()
+                self._dirty = True
+                self._rebuild_snapshot()
+                self._append_log({"op": "del", "id": document_id})
+                self._maybe_compact()
                 logger.debug(f"Unregistered document: {document_id}")
                 return True
             return False
@@ -108,15 +261,16 @@ class DocumentRegistry:
             Number of documents removed
         """
         with self._lock:
-            to_remove = [
-                doc_id for doc_id, meta in self._registry.items()
-                if meta.get("filename") == filename
-            ]
+            # O(1) index lookup instead of scanning every registry entry
+            to_remove = self._by_filename.pop(filename, set())
             for doc_id in to_remove:
-                del self._registry[doc_id]
+                self._registry.pop(doc_id, None)
+                self._dirty = True
+                self._append_log({"op": "del", "id": doc_id})
             
             if to_remove:
-                self._save()
+                self._rebuild_snapshot()
+                self._maybe_compact()
                 logger.debug(f"Unregistered {len(to_remove)} documents with filename: {filename}")
             
             return len(to_remove)
@@ -128,37 +282,29 @@ class DocumentRegistry:
         Returns:
             List of document metadata dicts with 'id' field added
         """
-        with self._lock:
-            return [
-                {
-                    "id": doc_id,
-                    "filename": meta.get("filename"),
-                    "upload_date": meta.get("upload_date"),
-                    "total_chunks": meta.get("total_chunks"),
-                    "metadata": meta
-                }
-                for doc_id, meta in self._registry.items()
-            ]
+        # Lock-free: the snapshot tuple is immutable, so a shallow list
+        # copy is all a caller needs (no per-request dict building)
+        return list(self._snapshot)
     
     def exists(self, document_id: str) -> bool:
-        """Check if a document is registered."""
-        with self._lock:
-            return document_id in self._registry
+        """Check if a document is registered (lock-free)."""
+        return document_id in self._index_snapshot
     
     def get(self, document_id: str) -> Optional[dict]:
-        """Get metadata for a specific document."""
-        with self._lock:
-            return self._registry.get(document_id)
+        """Get metadata for a specific document (lock-free)."""
+        return self._index_snapshot.get(document_id)
     
     def count(self) -> int:
-        """Get total number of registered documents."""
-        with self._lock:
-            return len(self._registry)
+        """Get total number of registered documents (lock-free)."""
+        return len(self._index_snapshot)
     
     def clear(self) -> None:
         """Clear the entire registry."""
         with self._lock:
             self._registry = {}
+            self._by_filename.clear()
+            self._dirty = True
+            self._rebuild_snapshot()
             self._save()
             logger.info("Registry cleared")
     
@@ -177,38 +323,55 @@ class DocumentRegistry:
         """
         logger.info("Syncing registry from Qdrant...")
         
+        from qdrant_client.http import models as qdrant_models
+        
         unique_docs = {}
-        offset = None
         limit = 100
         
-        while True:
-            points, next_offset = await vector_db_client.client.scroll(
+        # Only pull the payload keys the registry actually stores; the
+        # chunk text stays on the server instead of crossing the wire
+        payload_selector = qdrant_models.PayloadSelectorInclude(include=[
+            "document_id", "file_id", "filename", "course_name",
+            "upload_date", "total_chunks", "folder_path"
+        ])
+        
+        def _scroll(offset):
+            return vector_db_client.client.scroll(
                 collection_name=vector_db_client.collection_name,
                 limit=limit,
                 offset=offset,
-                with_payload=True,
+                with_payload=payload_selector,
                 with_vectors=False
             )
+        
+        # Pipeline the scroll: kick off the next page as soon as its
+        # offset is known, then process the current page while it flies
+        next_page = asyncio.ensure_future(_scroll(None))
+        while next_page is not None:
+            points, next_offset = await next_page
+            next_page = asyncio.ensure_future(_scroll(next_offset)) if next_offset is not None else None
             
             for point in points:
                 if point.payload:
                     doc_id = point.payload.get("document_id") or point.payload.get("file_id")
                     
-                    if doc_id and doc_id not in unique_docs:
-                        unique_docs[doc_id] = {
+                    if doc_id:
+                        unique_docs.setdefault(doc_id, {
                             "filename": point.payload.get("filename") or point.payload.get("course_name"),
                             "upload_date": point.payload.get("upload_date"),
                             "total_chunks": point.payload.get("total_chunks"),
                             "folder_path": point.payload.get("folder_path"),
-                        }
-            
-            offset = next_offset
-            if offset is None:
-                break
+                        })
         
         # Update registry
         with self._lock:
             self._registry = unique_docs
+            self._by_filename.clear()
+            for doc_id, meta in unique_docs.items():
+                if meta.get("filename"):
+                    self._by_filename[meta["filename"]].add(doc_id)
+            self._dirty = True
+            self._rebuild_snapshot()
             self._save()
         
         logger.info(f"Synced {len(unique_docs)} documents from Qdrant to registry")
@@ -6,6 +6,33 @@
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Tuple
+import mmap
+import os
+
+# Below this size mmap setup overhead outweighs what it saves
+_MMAP_THRESHOLD = 1 << 20
+
+
+def read_text_file(file_path: str) -> str:
+    """
+    Read a whole file as UTF-8 text (undecodable bytes ignored).
+
+    Files of 1MB and above are memory-mapped so the decoder reads
+    straight out of the page cache without an intermediate read() copy;
+    small files take the plain text-mode read.
+    """
+    if os.path.getsize(file_path) >= _MMAP_THRESHOLD:
+        with open(file_path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            mv = memoryview(mm)
+            try:
+                return str(mv, 'utf-8', 'ignore')
+            finally:
+                mv.release()
+                mm.close()
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
 
 class BaseExtractor(ABC):
     """Base class for all file extractors"""
@@ -7,11 +7,16 @@
 from typing import Tuple, Dict, Any
 import logging
 import os
-from .base import BaseExtractor
+import re
+from .base import BaseExtractor, read_text_file
 from exceptions import ExtractionError
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; matches both `namespace X.Y.Z;` (file-scoped) and
+# `namespace X.Y.Z {` (block) forms
+_NS_RE = re.compile(r'^\s*namespace\s+([\w.]+)', re.MULTILINE)
+
 class CsExtractor(BaseExtractor):
     def extract(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
         """
@@ -23,13 +28,14 @@ class CsExtractor(BaseExtractor):
         - Track file metadata (lines, size)
         """
         try:
-            # Default to UTF-8, fallback to latin-1 if needed (though ignore covers most)
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                text = file.read()
-            
+            # Default to UTF-8; decode errors are ignored, which covers most
+            text = read_text_file(file_path)
+
             # Basic metadata
             file_stats = os.stat(file_path)
-            line_count = len(text.splitlines())
+            # Count newlines in one C pass instead of materializing a
+            # list of line objects with splitlines()
+            line_count = text.count('\n') + (1 if text and not text.endswith('\n') else 0)
             
             metadata = {
                 "language": "cs",
@@ -37,11 +43,12 @@ class CsExtractor(BaseExtractor):
                 "line_count": line_count
             }
             
-            # Optional: Try to detect namespace (simple heuristic)
-            for line in text.splitlines()[:20]:  # Check first 20 lines
-                if line.strip().startswith("namespace "):
-                    metadata["namespace"] = line.strip().split()[1].rstrip(";")
-                    break
+            # Optional: Try to detect namespace (simple heuristic) — one
+            # regex scan over the head of the file instead of a per-line
+            # strip/split loop
+            m = _NS_RE.search(text, 0, 2000)
+            if m:
+                metadata["namespace"] = m.group(1)
             
             return text, metadata
             
@@ -6,22 +6,70 @@
 
 from typing import Tuple, Dict, Any
 import docx2txt
+import io
 import logging
+import zipfile
 from .base import BaseExtractor
 from exceptions import ExtractionError
 
+# lxml streams document.xml through libxml2 (C) without building the full
+# DOM docx2txt's ElementTree pass does; docx2txt stays as the fallback
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
 logger = logging.getLogger(__name__)
 
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
 class DocxExtractor(BaseExtractor):
+    @staticmethod
+    def _extract_lxml(file_path: str) -> str:
+        """Stream text runs out of the docx XML parts via iterparse."""
+        buf = io.StringIO()
+        write = buf.write
+        tags = (_W_NS + 't', _W_NS + 'tab', _W_NS + 'br', _W_NS + 'p')
+        with zipfile.ZipFile(file_path) as z:
+            # Headers and footers carry text too (docx2txt extracts
+            # them), so walk every word/*.xml part that holds runs:
+            # headers first, then the body, then footers — matching
+            # docx2txt's output order
+            names = z.namelist()
+            parts = (
+                sorted(n for n in names if n.startswith('word/header'))
+                + ['word/document.xml']
+                + sorted(n for n in names if n.startswith('word/footer'))
+            )
+            for part in parts:
+                with z.open(part) as xml:
+                    for _, el in etree.iterparse(xml, tag=tags):
+                        tag = el.tag
+                        if tag == tags[0]:
+                            if el.text:
+                                write(el.text)
+                        elif tag == tags[1]:
+                            write('\t')
+                        else:  # paragraph or line break
+                            write('\n')
+                        # Free each element as soon as it is consumed so
+                        # the tree never holds more than the current
+                        # subtree
+                        el.clear()
+        return buf.getvalue().strip()
+
     def extract(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
         try:
-            # docx2txt extracts text directly
-            text = docx2txt.process(file_path)
+            if etree is not None:
+                text = self._extract_lxml(file_path)
+            else:
+                # docx2txt extracts text directly
+                text = docx2txt.process(file_path)
             metadata = {} # DOCX metadata extraction is limited with docx2txt
-            
+
             return text, metadata
-            
+
         except Exception as e:
             logger.error(f"Error extracting DOCX {file_path}: {str(e)}")
             raise ExtractionError(f"Failed to extract DOCX: {str(e)}")
-
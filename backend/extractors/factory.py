@@ -5,7 +5,10 @@
 # =======================================================================
 
 import os
-from typing import Dict, Type
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, List, Tuple, Type
 from .base import BaseExtractor
 from .pdf_extractor import PDFExtractor
 from .docx_extractor import DocxExtractor
@@ -18,6 +21,18 @@ from .xlsx_extractor import XlsxExtractor
 from .csv_extractor import CsvExtractor
 from exceptions import InvalidFileFormatError
 
+
+def _extract_one(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """Module-level so ProcessPoolExecutor can pickle it for workers."""
+    return ExtractorFactory.get_extractor(file_path).extract(file_path)
+
+
+# Extractors whose heavy lifting happens in GIL-releasing C libraries
+# (zlib/libtiff/libtesseract); threads are enough for these, and we skip
+# the fork + pickle overhead of a process pool
+_GIL_RELEASING_EXTS = frozenset({'.pdf', '.jpg', '.jpeg', '.png', '.webp'})
+
+
 class ExtractorFactory:
     _extractors: Dict[str, Type[BaseExtractor]] = {
         '.pdf': PDFExtractor,
@@ -44,28 +59,82 @@ class ExtractorFactory:
         '.xlsx': XlsxExtractor,
         '.csv': CsvExtractor
     }
+    
+    # Frozen view of the dispatch table keys for cheap membership checks
+    SUPPORTED_EXTENSIONS = frozenset(_extractors)
+    
+    # Extractors are stateless, so one shared instance per type serves
+    # every file instead of a fresh allocation per call
+    _instances: Dict[str, BaseExtractor] = {}
+    _lock = Lock()
 
-    @classmethod
-    def get_extractor(cls, file_path: str) -> BaseExtractor:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def get_extractor(file_path: str) -> BaseExtractor:
         """
         Get the appropriate extractor for the given file path.
-        
+
+        Re-crawl workloads hit this with the same paths over and over, so
+        the whole lookup is memoized per path; repeat calls are one cache
+        probe. Call get_extractor.cache_clear() if the dispatch table is
+        ever reconfigured.
+
         Args:
             file_path: Path to the file
-            
+
         Returns:
             An instance of the appropriate extractor
-            
+
         Raises:
             InvalidFileFormatError: If the file extension is not supported
         """
-        _, ext = os.path.splitext(file_path)
-        ext = ext.lower()
-        
+        cls = ExtractorFactory
+        # Slice the extension directly; os.path.splitext allocates an
+        # extra tuple + string on the hottest dispatch call
+        dot = file_path.rfind('.')
+        ext = file_path[dot:].lower() if dot != -1 else ''
+
         extractor_class = cls._extractors.get(ext)
-        
+
         if not extractor_class:
             raise InvalidFileFormatError(f"Unsupported file extension: {ext}")
-            
-        return extractor_class()
+
+        instance = cls._instances.get(ext)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(ext)
+                if instance is None:
+                    instance = cls._instances[ext] = extractor_class()
+        return instance
+
+    @classmethod
+    def extract_many(cls, paths: List[str], max_workers: int = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Extract a batch of files in parallel.
+
+        Args:
+            paths: Paths to the files to extract
+            max_workers: Pool size (defaults to the CPU count)
+
+        Returns:
+            List of (text, metadata) tuples in the same order as paths
+        """
+        if not paths:
+            return []
+        if len(paths) == 1:
+            return [_extract_one(paths[0])]
+
+        workers = max_workers or os.cpu_count()
+
+        # Pick the pool type by what the batch is dominated by: C-bound
+        # extractors release the GIL, so threads get the parallelism
+        # without per-task pickling; pure-Python extractors need processes
+        gil_releasing = sum(
+            1 for p in paths
+            if p[p.rfind('.'):].lower() in _GIL_RELEASING_EXTS
+        )
+        pool_cls = ThreadPoolExecutor if gil_releasing * 2 >= len(paths) else ProcessPoolExecutor
+
+        with pool_cls(max_workers=min(workers, len(paths))) as executor:
+            return list(executor.map(_extract_one, paths, chunksize=4))
 
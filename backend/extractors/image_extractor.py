@@ -6,12 +6,23 @@
 
 from typing import Tuple, Dict, Any
 from PIL import Image
+from threading import Lock
 import pytesseract
 import logging
 import os
 from .base import BaseExtractor
 from exceptions import ExtractionError
 
+# tesserocr binds libtesseract in-process, skipping the per-call fork +
+# temp-PNG round trip pytesseract does. One API handle is reused across
+# files; the Tesseract API is not thread-safe, hence the lock
+try:
+    from tesserocr import PyTessBaseAPI
+    _TESS = PyTessBaseAPI()
+    _TESS_LOCK = Lock()
+except (ImportError, RuntimeError):
+    _TESS = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -32,15 +43,28 @@ class ImageExtractor(BaseExtractor):
                 width, height = img.size
                 format = img.format
                 mode = img.mode
-                
+
+                # Tesseract runtime scales with pixel count; above ~2000px
+                # the extra resolution buys no accuracy, so clamp large
+                # photos before the grayscale conversion
+                downscaled = False
+                if max(width, height) > 2000:
+                    img.thumbnail((2000, 2000), Image.Resampling.LANCZOS)
+                    downscaled = True
+
                 # Convert to grayscale for better OCR accuracy
                 # This is a basic preprocessing step
                 gray_img = img.convert('L')
                 
-                # Extract text using pytesseract
-                # timeout=10 to prevent hanging on very large/complex images
-                text = pytesseract.image_to_string(gray_img, timeout=10)
-                
+                if _TESS is not None:
+                    with _TESS_LOCK:
+                        _TESS.SetImage(gray_img)
+                        text = _TESS.GetUTF8Text()
+                else:
+                    # Extract text using pytesseract
+                    # timeout=10 to prevent hanging on very large/complex images
+                    text = pytesseract.image_to_string(gray_img, timeout=10)
+
                 # Clean up the text
                 text = text.strip()
                 
@@ -53,6 +77,8 @@ class ImageExtractor(BaseExtractor):
                     "file_size": os.path.getsize(file_path),
                     "ocr_engine": "tesseract"
                 }
+                if downscaled:
+                    metadata["ocr_downscaled"] = True
                 
                 if not text:
                     logger.warning(f"No text extracted from image: {file_path}")
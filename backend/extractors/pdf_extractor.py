@@ -5,38 +5,83 @@
 # =======================================================================
 
 from typing import Tuple, Dict, Any
+import io
 import pypdf
 import logging
 from .base import BaseExtractor
 from exceptions import ExtractionError
 
+# pypdfium2 binds the PDFium C library; its text extraction runs natively
+# instead of interpreting content streams in Python, so prefer it when
+# installed and keep pypdf as the pure-Python fallback
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
 logger = logging.getLogger(__name__)
 
 class PDFExtractor(BaseExtractor):
     def extract(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
         try:
-            text_content = []
+            if pdfium is not None:
+                return self._extract_pdfium(file_path)
+
+            # One growable buffer instead of a list of page strings plus
+            # a final join copy; keeps peak memory at ~1x the text size
+            buf = io.StringIO()
             metadata = {"page_count": 0}
-            
+
             with open(file_path, 'rb') as file:
                 reader = pypdf.PdfReader(file)
                 metadata["page_count"] = len(reader.pages)
-                
+
                 # Extract metadata if available
                 if reader.metadata:
                     if reader.metadata.author:
                         metadata["author"] = reader.metadata.author
                     if reader.metadata.title:
                         metadata["title"] = reader.metadata.title
-                
-                for i, page in enumerate(reader.pages):
+
+                # Sequential on purpose: pypdf resolves indirect objects
+                # lazily with unsynchronized seek()+read() on the shared
+                # file handle and is not thread-safe, so threading pages
+                # here can silently corrupt the extracted text. Parallel
+                # extraction belongs to the pdfium path above
+                for page in reader.pages:
                     text = page.extract_text()
                     if text:
-                        text_content.append(text)
-            
-            return "\n\n".join(text_content), metadata
+                        buf.write(text)
+                        buf.write("\n\n")
+
+            return buf.getvalue().rstrip("\n"), metadata
             
         except Exception as e:
             logger.error(f"Error extracting PDF {file_path}: {str(e)}")
             raise ExtractionError(f"Failed to extract PDF: {str(e)}")
 
+    def _extract_pdfium(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        """Extract via PDFium (C) — same output shape as the pypdf path."""
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            metadata = {"page_count": len(pdf)}
+
+            doc_meta = pdf.get_metadata_dict(skip_empty=True)
+            if doc_meta.get("Author"):
+                metadata["author"] = doc_meta["Author"]
+            if doc_meta.get("Title"):
+                metadata["title"] = doc_meta["Title"]
+
+            text_content = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+                if text:
+                    text_content.append(text)
+
+            return "\n\n".join(text_content), metadata
+        finally:
+            pdf.close()
+
@@ -6,7 +6,7 @@
 
 from typing import Tuple, Dict, Any
 import logging
-from .base import BaseExtractor
+from .base import BaseExtractor, read_text_file
 from exceptions import ExtractionError
 
 logger = logging.getLogger(__name__)
@@ -14,9 +14,8 @@ logger = logging.getLogger(__name__)
 class TextExtractor(BaseExtractor):
     def extract(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                text = file.read()
-            
+            text = read_text_file(file_path)
+
             metadata = {"encoding": "utf-8"}
             return text, metadata
             
@@ -5,15 +5,87 @@
 # =======================================================================
 
 import io
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Tuple, Optional
 import openpyxl
 from openpyxl.utils.exceptions import InvalidFileException
 from .base import BaseExtractor
 from exceptions import ExtractionError
 
+# python-calamine parses the xlsx zip in Rust, typically 5-20x faster
+# than openpyxl's Python XML parsing; openpyxl remains the fallback
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
 class XlsxExtractor(BaseExtractor):
     """Extractor for Excel (.xlsx) files."""
 
+    @staticmethod
+    def _process_sheet(wb, sheet_name: str) -> Tuple[str, int]:
+        """Render one sheet to text; returns (text, cells_processed)."""
+        sheet = wb[sheet_name]
+        # One growable buffer per sheet; hoisting the bound write method
+        # and using map/filter keeps the per-row cost down on
+        # million-cell sheets
+        buf = io.StringIO()
+        write = buf.write
+        cell_count = 0
+
+        for row in sheet.iter_rows(values_only=True):
+            # Empty cells come back as None; drop them, stringify the
+            # rest in C instead of a per-cell Python loop
+            row_values = list(map(str, filter(lambda c: c is not None, row)))
+            if row_values:
+                write(" | ".join(row_values))
+                write("\n")
+                cell_count += len(row_values)
+
+        return buf.getvalue().rstrip("\n"), cell_count
+
+    def _extract_calamine(self, file_path: str, file_content: Optional[bytes]) -> Tuple[str, Dict[str, Any]]:
+        """Extract via calamine (Rust) — same output shape as openpyxl."""
+        if file_content:
+            wb = CalamineWorkbook.from_filelike(io.BytesIO(file_content))
+        else:
+            wb = CalamineWorkbook.from_path(file_path)
+
+        sheet_names = wb.sheet_names
+        metadata = {
+            "sheet_count": len(sheet_names),
+            "sheet_names": sheet_names,
+        }
+
+        text_parts = []
+        total_cells = 0
+
+        for sheet_name in sheet_names:
+            rows = wb.get_sheet_by_name(sheet_name).to_python(skip_empty_area=True)
+            buf = io.StringIO()
+            write = buf.write
+            cell_count = 0
+
+            for row in rows:
+                # calamine yields "" for empty cells where openpyxl
+                # yields None; drop both
+                row_values = list(map(str, filter(lambda c: c is not None and c != "", row)))
+                if row_values:
+                    write(" | ".join(row_values))
+                    write("\n")
+                    cell_count += len(row_values)
+
+            total_cells += cell_count
+            sheet_text = buf.getvalue()
+            if sheet_text:
+                text_parts.append(f"Sheet: {sheet_name}")
+                text_parts.append(sheet_text.rstrip("\n"))
+                text_parts.append("-" * 20)  # Separator between sheets
+
+        metadata["total_cells_processed"] = total_cells
+
+        return "\n".join(text_parts), metadata
+
     def extract(self, file_path: str, file_content: Optional[bytes] = None) -> Tuple[str, Dict[str, Any]]:
         """
         Extract text content and metadata from an Excel file.
@@ -26,6 +98,9 @@ class XlsxExtractor(BaseExtractor):
             Tuple containing (extracted_text, metadata)
         """
         try:
+            if CalamineWorkbook is not None:
+                return self._extract_calamine(file_path, file_content)
+
             if file_content:
                 wb = openpyxl.load_workbook(filename=io.BytesIO(file_content), data_only=True, read_only=True)
             else:
@@ -44,21 +119,23 @@ class XlsxExtractor(BaseExtractor):
                 "modified": str(wb.properties.modified) if wb.properties.modified else None,
             }
             
-            for sheet_name in wb.sheetnames:
-                sheet = wb[sheet_name]
-                sheet_text = []
-                
-                # Iterate through rows
-                for row in sheet.iter_rows(values_only=True):
-                    # Filter out None values and convert to string
-                    row_values = [str(cell) for cell in row if cell is not None]
-                    if row_values:
-                        sheet_text.append(" | ".join(row_values))
-                        total_cells += len(row_values)
-                
+            sheet_names = wb.sheetnames
+            if len(sheet_names) > 2:
+                # read_only worksheets each stream from the archive
+                # independently, so sheets can be read concurrently;
+                # map() preserves workbook sheet order
+                with ThreadPoolExecutor(max_workers=min(8, len(sheet_names))) as executor:
+                    results = list(executor.map(
+                        lambda name: self._process_sheet(wb, name), sheet_names
+                    ))
+            else:
+                results = [self._process_sheet(wb, name) for name in sheet_names]
+
+            for sheet_name, (sheet_text, cell_count) in zip(sheet_names, results):
+                total_cells += cell_count
                 if sheet_text:
                     text_parts.append(f"Sheet: {sheet_name}")
-                    text_parts.append("\n".join(sheet_text))
+                    text_parts.append(sheet_text)
                     text_parts.append("-" * 20)  # Separator between sheets
             
             metadata["total_cells_processed"] = total_cells
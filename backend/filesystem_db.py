@@ -1,235 +1,342 @@
-# =======================================================================
-# i3T4AN (Ethan Blair)
-# Project:      Vector Knowledge Base
-# File:         File system database operations (async)
-# =======================================================================
-
-"""
-Database module for the file system organization layer.
-Manages folders and file-to-folder mappings using SQLite with async operations.
-"""
-import aiosqlite
-import sqlite3
-import uuid
-from typing import List, Dict, Optional
-import logging
-from constants import FOLDER_NULL
-
-logger = logging.getLogger(__name__)
-
-
-class FileSystemDB:
-    def __init__(self, db_path: str = "metadata.db"):
-        self.db_path = db_path
-        # Sync init to create tables on startup
-        self._init_db_sync()
-    
-    def _init_db_sync(self):
-        """Initialize the database with required tables (sync, called once at startup)."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Enable WAL mode for better concurrency
-        cursor.execute("PRAGMA journal_mode=WAL")
-        
-        # Folders table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS folders (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                parent_id TEXT,
-                FOREIGN KEY (parent_id) REFERENCES folders(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # File-to-folder mapping table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS file_folders (
-                document_id TEXT PRIMARY KEY,
-                filename TEXT NOT NULL,
-                folder_id TEXT,
-                FOREIGN KEY (folder_id) REFERENCES folders(id) ON DELETE SET NULL
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-        logger.info("File system database initialized (WAL mode enabled)")
-    
-    async def get_all_folders(self) -> List[Dict]:
-        """Get all folders."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT id, name, parent_id FROM folders") as cursor:
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
-    
-    async def create_folder(self, name: str, parent_id: Optional[str] = None) -> str:
-        """Create a new folder."""
-        folder_id = str(uuid.uuid4())
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                "INSERT INTO folders (id, name, parent_id) VALUES (?, ?, ?)",
-                (folder_id, name, parent_id)
-            )
-            await db.commit()
-        logger.info(f"Created folder: {name} (ID: {folder_id}, Parent: {parent_id})")
-        return folder_id
-    
-    async def update_folder(self, folder_id: str, name: Optional[str] = None, parent_id: Optional[str] = None):
-        """Update a folder's name or parent."""
-        updates = []
-        params = []
-        
-        if name is not None:
-            updates.append("name = ?")
-            params.append(name)
-        
-        if parent_id is not None:
-            updates.append("parent_id = ?")
-            params.append(parent_id)
-        
-        if updates:
-            params.append(folder_id)
-            query = f"UPDATE folders SET {', '.join(updates)} WHERE id = ?"
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute(query, params)
-                await db.commit()
-        logger.info(f"Updated folder ID: {folder_id}")
-    
-    async def delete_folder(self, folder_id: str):
-        """Delete a folder. Files in it become unsorted."""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Remove file associations (files become unsorted)
-            await db.execute("DELETE FROM file_folders WHERE folder_id = ?", (folder_id,))
-            # Delete the folder
-            await db.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
-            await db.commit()
-        logger.info(f"Deleted folder ID: {folder_id}")
-    
-    async def move_file_to_folder(self, document_id: str, filename: str, folder_id: Optional[str]):
-        """Assign a file to a folder. folder_id='unsorted' removes mapping. None=Root."""
-        async with aiosqlite.connect(self.db_path) as db:
-            if folder_id == 'unsorted':
-                # Moving to unsorted: DELETE the entry entirely
-                await db.execute("DELETE FROM file_folders WHERE document_id = ?", (document_id,))
-                logger.info(f"Moved {filename} (doc:{document_id}) to unsorted")
-            else:
-                # Moving to a folder (or Root if None): INSERT or UPDATE
-                async with db.execute("SELECT document_id FROM file_folders WHERE document_id = ?", (document_id,)) as cursor:
-                    exists = await cursor.fetchone()
-                
-                if exists:
-                    await db.execute(
-                        "UPDATE file_folders SET folder_id = ?, filename = ? WHERE document_id = ?",
-                        (folder_id, filename, document_id)
-                    )
-                else:
-                    await db.execute(
-                        "INSERT INTO file_folders (document_id, filename, folder_id) VALUES (?, ?, ?)",
-                        (document_id, filename, folder_id)
-                    )
-                logger.info(f"Moved {filename} (doc:{document_id}) to folder {folder_id}")
-            await db.commit()
-    
-    async def get_files_in_folders(self) -> Dict[str, List[Dict]]:
-        """Get a mapping of folder_id -> [{document_id, filename}, ...]."""
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute("SELECT document_id, filename, folder_id FROM file_folders") as cursor:
-                rows = await cursor.fetchall()
-        
-        # Build mapping
-        result = {}
-        for document_id, filename, folder_id in rows:
-            key = str(folder_id) if folder_id is not None else FOLDER_NULL
-            if key not in result:
-                result[key] = []
-            result[key].append({"document_id": document_id, "filename": filename})
-        
-        return result
-    
-    async def get_unsorted_files(self, all_docs: List[Dict]) -> List[Dict]:
-        """
-        Get files that are not assigned to any folder.
-        all_docs: List of document dicts with 'id' (document_id) and 'filename'.
-        """
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute("SELECT document_id FROM file_folders") as cursor:
-                rows = await cursor.fetchall()
-                sorted_doc_ids = {row[0] for row in rows}
-        
-        # Return docs that are not in the sorted set
-        unsorted = [doc for doc in all_docs if doc.get('id') not in sorted_doc_ids]
-        return unsorted
-    
-    async def remove_file(self, document_id: str):
-        """Remove a file from the file system (called when document is deleted)."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("DELETE FROM file_folders WHERE document_id = ?", (document_id,))
-            await db.commit()
-        logger.info(f"Removed document {document_id} from file system")
-
-    async def remove_file_by_filename(self, filename: str):
-        """Remove a file from the file system by filename."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("DELETE FROM file_folders WHERE filename = ?", (filename,))
-            await db.commit()
-        logger.info(f"Removed file {filename} from file system")
-
-    async def get_or_create_folder_path(self, path_components: List[str]) -> str:
-        """
-        Get or create a folder path from a list of folder names.
-        
-        Args:
-            path_components: List of folder names in order, e.g., ['schoolwork', 'senior year', 'math']
-        
-        Returns:
-            The ID of the final folder in the path
-        """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            current_parent_id = None  # Start at root
-            
-            for folder_name in path_components:
-                # Check if folder exists under current parent
-                if current_parent_id is None:
-                    async with db.execute(
-                        "SELECT id FROM folders WHERE name = ? AND parent_id IS NULL",
-                        (folder_name,)
-                    ) as cursor:
-                        result = await cursor.fetchone()
-                else:
-                    async with db.execute(
-                        "SELECT id FROM folders WHERE name = ? AND parent_id = ?",
-                        (folder_name, current_parent_id)
-                    ) as cursor:
-                        result = await cursor.fetchone()
-                
-                if result:
-                    # Folder exists, use it
-                    current_parent_id = result[0]
-                    logger.info(f"Found existing folder: {folder_name} (ID: {current_parent_id})")
-                else:
-                    # Folder doesn't exist, create it
-                    folder_id = str(uuid.uuid4())
-                    await db.execute(
-                        "INSERT INTO folders (id, name, parent_id) VALUES (?, ?, ?)",
-                        (folder_id, folder_name, current_parent_id)
-                    )
-                    await db.commit()
-                    current_parent_id = folder_id
-                    logger.info(f"Created folder: {folder_name} (ID: {folder_id}, Parent: {current_parent_id})")
-            
-            return current_parent_id
-
-    async def reset_db(self):
-        """Reset the database by clearing all tables."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("DELETE FROM file_folders")
-            await db.execute("DELETE FROM folders")
-            await db.commit()
-        logger.info("File system database reset")
-
-
-# Global instance
-fs_db = FileSystemDB()
+# =======================================================================
+# i3T4AN (Ethan Blair)
+# Project:      Vector Knowledge Base
+# File:         File system database operations (async)
+# =======================================================================
+
+"""
+Database module for the file system organization layer.
+Manages folders and file-to-folder mappings using SQLite with async operations.
+"""
+import aiosqlite
+import asyncio
+import json
+import sqlite3
+import uuid
+from typing import List, Dict, Optional
+import logging
+from constants import FOLDER_NULL
+
+logger = logging.getLogger(__name__)
+
+
+class FileSystemDB:
+    def __init__(self, db_path: str = "metadata.db"):
+        self.db_path = db_path
+        # One long-lived connection shared by all methods: opening per
+        # call spawns a thread, re-opens the file + WAL, and discards the
+        # page cache every time
+        self._db: Optional[aiosqlite.Connection] = None
+        # SQLite allows a single writer; serialize writes here instead of
+        # relying on busy-handler retries
+        self._write_lock = asyncio.Lock()
+        # Sync init to create tables on startup
+        self._init_db_sync()
+
+    def _init_db_sync(self):
+        """Initialize the database with required tables (sync, called once at startup)."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        # Enable WAL mode for better concurrency (persists per database);
+        # the rest match the shared async connection's settings so the
+        # schema setup itself doesn't pay FULL-sync fsyncs
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.execute("PRAGMA temp_store=memory")
+        cursor.execute("PRAGMA cache_size=-64000")
+
+        # Folders table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS folders (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                parent_id TEXT,
+                FOREIGN KEY (parent_id) REFERENCES folders(id) ON DELETE CASCADE
+            )
+        """)
+
+        # File-to-folder mapping table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS file_folders (
+                document_id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                folder_id TEXT,
+                FOREIGN KEY (folder_id) REFERENCES folders(id) ON DELETE SET NULL
+            )
+        """)
+
+        # Point lookups used on every path walk and folder delete;
+        # without these both are full table scans
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_folders_parent_name ON folders(parent_id, name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_file_folders_folder ON file_folders(folder_id)")
+
+        conn.commit()
+        conn.close()
+        logger.info("File system database initialized (WAL mode enabled)")
+
+    async def connect(self):
+        """Open the shared connection (called from app startup)."""
+        if self._db is not None:
+            return
+        self._db = await aiosqlite.connect(self.db_path)
+        # WAL lets readers run during writes; NORMAL syncs once per
+        # checkpoint instead of per commit; the rest keep temp data and
+        # hot pages in memory and wait out short writer contention
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA synchronous=NORMAL")
+        await self._db.execute("PRAGMA temp_store=memory")
+        await self._db.execute("PRAGMA cache_size=-64000")
+        await self._db.execute("PRAGMA busy_timeout=30000")
+        logger.info("File system database connection opened")
+
+    async def close(self):
+        """Close the shared connection (called from app shutdown)."""
+        if self._db is not None:
+            # Refresh planner statistics so the indexes stay in use
+            await self._db.execute("PRAGMA optimize")
+            await self._db.close()
+            self._db = None
+            logger.info("File system database connection closed")
+
+    async def _conn(self) -> aiosqlite.Connection:
+        """Return the shared connection, opening it lazily if needed."""
+        if self._db is None:
+            await self.connect()
+        return self._db
+
+    async def get_all_folders(self) -> List[Dict]:
+        """Get all folders."""
+        db = await self._conn()
+        # execute_fetchall runs execute + fetchall + close as one hop
+        # through aiosqlite's worker-thread queue instead of three
+        rows = await db.execute_fetchall("SELECT id, name, parent_id FROM folders")
+        return [
+            {"id": row[0], "name": row[1], "parent_id": row[2]}
+            for row in rows
+        ]
+
+    async def create_folder(self, name: str, parent_id: Optional[str] = None) -> str:
+        """Create a new folder."""
+        folder_id = str(uuid.uuid4())
+        db = await self._conn()
+        async with self._write_lock:
+            await db.execute(
+                "INSERT INTO folders (id, name, parent_id) VALUES (?, ?, ?)",
+                (folder_id, name, parent_id)
+            )
+            await db.commit()
+        logger.info("Created folder: %s (ID: %s, Parent: %s)", name, folder_id, parent_id)
+        return folder_id
+
+    async def update_folder(self, folder_id: str, name: Optional[str] = None, parent_id: Optional[str] = None):
+        """Update a folder's name or parent."""
+        updates = []
+        params = []
+
+        if name is not None:
+            updates.append("name = ?")
+            params.append(name)
+
+        if parent_id is not None:
+            updates.append("parent_id = ?")
+            params.append(parent_id)
+
+        if updates:
+            params.append(folder_id)
+            query = f"UPDATE folders SET {', '.join(updates)} WHERE id = ?"
+            db = await self._conn()
+            async with self._write_lock:
+                await db.execute(query, params)
+                await db.commit()
+        logger.info("Updated folder ID: %s", folder_id)
+
+    async def delete_folder(self, folder_id: str):
+        """Delete a folder. Files in it become unsorted."""
+        db = await self._conn()
+        async with self._write_lock:
+            # Remove file associations (files become unsorted)
+            await db.execute("DELETE FROM file_folders WHERE folder_id = ?", (folder_id,))
+            # Delete the folder
+            await db.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
+            await db.commit()
+        logger.info("Deleted folder ID: %s", folder_id)
+
+    async def move_file_to_folder(self, document_id: str, filename: str, folder_id: Optional[str]):
+        """Assign a file to a folder. folder_id='unsorted' removes mapping. None=Root."""
+        db = await self._conn()
+        async with self._write_lock:
+            if folder_id == 'unsorted':
+                # Moving to unsorted: DELETE the entry entirely
+                await db.execute("DELETE FROM file_folders WHERE document_id = ?", (document_id,))
+                logger.info("Moved %s (doc:%s) to unsorted", filename, document_id)
+            else:
+                # Moving to a folder (or Root if None): one UPSERT
+                # instead of SELECT then INSERT-or-UPDATE — a single
+                # statement execution and a single awaited round trip
+                await db.execute(
+                    """
+                    INSERT INTO file_folders (document_id, filename, folder_id) VALUES (?, ?, ?)
+                    ON CONFLICT(document_id) DO UPDATE SET
+                        folder_id = excluded.folder_id,
+                        filename = excluded.filename
+                    """,
+                    (document_id, filename, folder_id)
+                )
+                logger.info("Moved %s (doc:%s) to folder %s", filename, document_id, folder_id)
+            await db.commit()
+
+    async def move_files_to_folder(self, items: List[tuple]) -> None:
+        """
+        Assign many files to folders in one transaction.
+
+        Args:
+            items: (document_id, filename, folder_id) tuples with the
+                   same folder_id semantics as move_file_to_folder
+        """
+        if not items:
+            return
+        db = await self._conn()
+        async with self._write_lock:
+            # executemany re-binds one prepared statement per group, and
+            # the single commit means one fsync for the whole batch
+            unsorted = [(doc_id,) for doc_id, _, folder_id in items if folder_id == 'unsorted']
+            moves = [item for item in items if item[2] != 'unsorted']
+            if unsorted:
+                await db.executemany("DELETE FROM file_folders WHERE document_id = ?", unsorted)
+            if moves:
+                await db.executemany(
+                    """
+                    INSERT INTO file_folders (document_id, filename, folder_id) VALUES (?, ?, ?)
+                    ON CONFLICT(document_id) DO UPDATE SET
+                        folder_id = excluded.folder_id,
+                        filename = excluded.filename
+                    """,
+                    moves
+                )
+            await db.commit()
+        logger.info("Moved %d files in one transaction", len(items))
+
+    async def remove_files(self, document_ids: List[str]) -> None:
+        """Remove many files in one transaction (one fsync total)."""
+        if not document_ids:
+            return
+        db = await self._conn()
+        async with self._write_lock:
+            await db.executemany(
+                "DELETE FROM file_folders WHERE document_id = ?",
+                [(doc_id,) for doc_id in document_ids]
+            )
+            await db.commit()
+        logger.info("Removed %d documents from file system", len(document_ids))
+
+    async def get_files_in_folders(self) -> Dict[str, List[Dict]]:
+        """Get a mapping of folder_id -> [{document_id, filename}, ...]."""
+        db = await self._conn()
+        # Group server-side: json_group_array aggregates in C, returning
+        # one row per folder instead of one tuple per file for Python to
+        # re-group
+        rows = await db.execute_fetchall(
+            "SELECT COALESCE(folder_id, ?) AS key, "
+            "json_group_array(json_object('document_id', document_id, 'filename', filename)) "
+            "FROM file_folders GROUP BY key",
+            (FOLDER_NULL,)
+        )
+
+        return {key: json.loads(files) for key, files in rows}
+
+    async def get_unsorted_files(self, all_docs: List[Dict]) -> List[Dict]:
+        """
+        Get files that are not assigned to any folder.
+        all_docs: List of document dicts with 'id' (document_id) and 'filename'.
+        """
+        if not all_docs:
+            return []
+        db = await self._conn()
+        # Anti-join in SQLite: pass the candidate IDs through json_each
+        # and let the VDBE probe the file_folders primary key, instead of
+        # pulling the whole table into a Python set
+        ids_json = json.dumps([doc.get('id') for doc in all_docs])
+        rows = await db.execute_fetchall(
+            "SELECT value FROM json_each(?) "
+            "WHERE value NOT IN (SELECT document_id FROM file_folders)",
+            (ids_json,)
+        )
+        unsorted_ids = {row[0] for row in rows}
+
+        # Preserve the caller's ordering
+        return [doc for doc in all_docs if doc.get('id') in unsorted_ids]
+
+    async def remove_file(self, document_id: str):
+        """Remove a file from the file system (called when document is deleted)."""
+        db = await self._conn()
+        async with self._write_lock:
+            await db.execute("DELETE FROM file_folders WHERE document_id = ?", (document_id,))
+            await db.commit()
+        logger.info("Removed document %s from file system", document_id)
+
+    async def remove_file_by_filename(self, filename: str):
+        """Remove a file from the file system by filename."""
+        db = await self._conn()
+        async with self._write_lock:
+            await db.execute("DELETE FROM file_folders WHERE filename = ?", (filename,))
+            await db.commit()
+        logger.info("Removed file %s from file system", filename)
+
+    async def get_or_create_folder_path(self, path_components: List[str]) -> str:
+        """
+        Get or create a folder path from a list of folder names.
+
+        Args:
+            path_components: List of folder names in order, e.g., ['schoolwork', 'senior year', 'math']
+
+        Returns:
+            The ID of the final folder in the path
+        """
+        db = await self._conn()
+        async with self._write_lock:
+            current_parent_id = None  # Start at root
+
+            for folder_name in path_components:
+                # Check if folder exists under current parent. IS matches
+                # NULL parents too, so one statement covers the root and
+                # nested cases and stays hot in the statement cache
+                async with db.execute(
+                    "SELECT id FROM folders WHERE name = ? AND parent_id IS ?",
+                    (folder_name, current_parent_id)
+                ) as cursor:
+                    result = await cursor.fetchone()
+
+                if result:
+                    # Folder exists, use it
+                    current_parent_id = result[0]
+                    logger.debug("Found existing folder: %s (ID: %s)", folder_name, current_parent_id)
+                else:
+                    # Folder doesn't exist, create it
+                    folder_id = str(uuid.uuid4())
+                    await db.execute(
+                        "INSERT INTO folders (id, name, parent_id) VALUES (?, ?, ?)",
+                        (folder_id, folder_name, current_parent_id)
+                    )
+                    current_parent_id = folder_id
+                    logger.info("Created folder: %s (ID: %s, Parent: %s)", folder_name, folder_id, current_parent_id)
+
+            # One commit for the whole walk: committing per component
+            # meant one fsync per path segment, which dominates the cost
+            # of these tiny inserts
+            await db.commit()
+            return current_parent_id
+
+    async def reset_db(self):
+        """Reset the database by clearing all tables."""
+        db = await self._conn()
+        async with self._write_lock:
+            await db.execute("DELETE FROM file_folders")
+            await db.execute("DELETE FROM folders")
+            await db.commit()
+        logger.info("File system database reset")
+
+
+# Global instance
+fs_db = FileSystemDB()
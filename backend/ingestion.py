@@ -1,197 +1,239 @@
-# =======================================================================
-# i3T4AN (Ethan Blair)
-# Project:      Vector Knowledge Base
-# File:         Document ingestion pipeline
-# =======================================================================
-
-"""
-Ingestion Service - Handles file upload and processing
-"""
-from fastapi import UploadFile
-import os
-import re
-import uuid
-import time
-import logging
-from typing import Dict, Any
-from config import settings
-from extractors.factory import ExtractorFactory
-from chunker import chunker
-from embedding_service import embedding_service
-from vector_db import vector_db
-from exceptions import InvalidFileFormatError, FileSizeExceededError, ExtractionError
-
-logger = logging.getLogger(__name__)
-
-
-def sanitize_filename(filename: str) -> str:
-    """
-    Sanitize a filename to be safe for all filesystems.
-    
-    - Removes path components (prevents path traversal)
-    - Removes null bytes and control characters
-    - Replaces Windows-illegal characters: < > : " / \\ | ? *
-    - Limits filename length to 200 characters
-    - Handles empty or whitespace-only names
-    """
-    # Remove path components
-    filename = os.path.basename(filename)
-    
-    # Remove null bytes and control characters
-    filename = re.sub(r'[\x00-\x1f\x7f]', '', filename)
-    
-    # Replace Windows-illegal characters: < > : " / \ | ? *
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-    
-    # Limit length (255 is common max, leave room for unique suffix)
-    if len(filename) > 200:
-        name, ext = os.path.splitext(filename)
-        filename = name[:200-len(ext)] + ext
-    
-    # Handle empty or whitespace-only names
-    if not filename.strip():
-        filename = "unnamed_file"
-    
-    return filename.strip()
-
-
-class IngestionService:
-    def __init__(self):
-        pass
-    
-    async def process_file(self, file: UploadFile, extra_metadata: Dict[str, Any] = None) -> Dict[str, Any]:
-        """
-        Process an uploaded file through the ingestion pipeline.
-        """
-        try:
-            # Save file temporarily (use basename to avoid path issues)
-            file_id = str(uuid.uuid4())
-            safe_filename = sanitize_filename(file.filename)
-            file_path = os.path.join(settings.UPLOAD_DIR, safe_filename)
-            
-            with open(file_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-            
-            logger.info(f"Saved file: {safe_filename}")
-            
-            # Extract text
-            extractor = ExtractorFactory.get_extractor(file_path)
-            text, extracted_metadata = extractor.extract(file_path)
-            
-            if not text or not text.strip():
-                raise ExtractionError(f"No text could be extracted from {safe_filename}")
-            
-            # Chunk text
-            chunks = chunker.chunk_text(text)
-            logger.info(f"Created {len(chunks)} chunks from {safe_filename}")
-            
-            # Prepare metadata
-            metadata = extra_metadata or {}
-            metadata["filename"] = safe_filename  # Use safe_filename instead of file.filename
-            metadata["file_id"] = file_id
-            metadata["upload_date"] = time.time()
-            metadata["total_chunks"] = len(chunks)
-            
-            # Embed and store chunks
-            document_id = str(uuid.uuid4())
-            
-            # Extract all chunk texts first
-            chunk_texts = []
-            for chunk_data in chunks:
-                chunk_text = chunk_data.get("text", chunk_data) if isinstance(chunk_data, dict) else chunk_data
-                chunk_texts.append(chunk_text)
-            
-            # OPTIMIZATION: Batch embed all chunks at once (async, runs in thread pool)
-            vectors = await embedding_service.embed_batch_async(chunk_texts)
-            
-            # Prepare metadata for all chunks
-            metadata_list = []
-            for i, chunk_text in enumerate(chunk_texts):
-                chunk_metadata = {
-                    **metadata,
-                    "text": chunk_text,
-                    "chunk_index": i,
-                    "document_id": document_id
-                }
-                metadata_list.append(chunk_metadata)
-            
-            # Batch insert all vectors
-            await vector_db.upsert_vectors(vectors, metadata_list)
-            
-            return {
-                "file_id": file_id,
-                "filename": safe_filename,  # Use safe_filename here too
-                "status": "success",
-                "chunks_count": len(chunks),
-                "document_id": document_id,
-                "message": f"Successfully processed {safe_filename}"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error processing file {file.filename}: {e}")
-            raise
-
-    async def process_file_batch(self, file: UploadFile, extra_metadata: Dict[str, Any] = None) -> Dict[str, Any]:
-        """
-        Process a file for batch ingestion (save, extract, chunk) but DO NOT embed or upsert.
-        Returns the chunks and metadata for batch processing by the caller.
-        """
-        try:
-            # Save file temporarily
-            file_id = str(uuid.uuid4())
-            safe_filename = sanitize_filename(file.filename)
-            file_path = os.path.join(settings.UPLOAD_DIR, safe_filename)
-            
-            with open(file_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-            
-            logger.info(f"Saved file for batch: {safe_filename}")
-            
-            # Extract text
-            extractor = ExtractorFactory.get_extractor(file_path)
-            text, extracted_metadata = extractor.extract(file_path)
-            
-            if not text or not text.strip():
-                raise ExtractionError(f"No text could be extracted from {safe_filename}")
-            
-            # Chunk text
-            chunks = chunker.chunk_text(text)
-            
-            # Prepare metadata
-            metadata = extra_metadata or {}
-            metadata["filename"] = safe_filename
-            metadata["file_id"] = file_id
-            metadata["upload_date"] = time.time()
-            metadata["total_chunks"] = len(chunks)
-            
-            # Prepare chunks with metadata
-            chunks_with_metadata = []
-            for i, chunk_data in enumerate(chunks):
-                chunk_text = chunk_data.get("text", chunk_data) if isinstance(chunk_data, dict) else chunk_data
-                
-                chunk_metadata = {
-                    **metadata,
-                    "text": chunk_text,
-                    "chunk_index": i
-                    # document_id will be assigned by caller
-                }
-                chunks_with_metadata.append({
-                    "text": chunk_text,
-                    "metadata": chunk_metadata
-                })
-            
-            return {
-                "filename": safe_filename,
-                "file_id": file_id,
-                "chunks": chunks_with_metadata,
-                "chunks_count": len(chunks)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error processing file batch {file.filename}: {e}")
-            raise
-
-# Global instance
-ingestion_service = IngestionService()
+# =======================================================================
+# i3T4AN (Ethan Blair)
+# Project:      Vector Knowledge Base
+# File:         Document ingestion pipeline
+# =======================================================================
+
+"""
+Ingestion Service - Handles file upload and processing
+"""
+from fastapi import UploadFile
+import aiofiles
+import asyncio
+import os
+import re
+import uuid
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Tuple
+from config import settings
+from extractors.factory import ExtractorFactory, _extract_one
+from chunker import chunker
+from embedding_service import embedding_service
+from vector_db import vector_db
+from exceptions import InvalidFileFormatError, FileSizeExceededError, ExtractionError
+
+logger = logging.getLogger(__name__)
+
+# Extraction is CPU-bound (PDF parsing, OCR, XML); running it on the
+# event loop stalls every other request, so it goes to worker processes
+# that sidestep the GIL entirely. Workers spawn lazily on first use.
+# The submitted function lives in extractors.factory so spawn-mode
+# workers (Windows) import only the extractors package — not this
+# module, whose chunker/embedding_service imports would load the
+# tokenizer and torch stack in every worker
+_EXTRACT_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+async def _extract_async(file_path: str) -> Tuple[str, Dict[str, Any]]:
+    """Run extraction off the event loop, preferring worker processes."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_EXTRACT_POOL, _extract_one, file_path)
+    except BrokenProcessPool:
+        # Still yields the loop even though it can't parallelize CPU
+        logger.warning("Extraction process pool unavailable, falling back to a thread")
+        return await loop.run_in_executor(None, _extract_one, file_path)
+
+# One translation table replaces both sanitization regex passes: control
+# characters map to None (deleted), Windows-illegal characters to '_',
+# and str.translate applies it in a single C-speed scan
+_SANITIZE_TABLE = {c: None for c in range(0x20)}
+_SANITIZE_TABLE[0x7f] = None
+_SANITIZE_TABLE.update({ord(c): ord('_') for c in '<>:"/\\|?*'})
+
+
+def sanitize_filename(filename: str) -> str:
+    """
+    Sanitize a filename to be safe for all filesystems.
+    
+    - Removes path components (prevents path traversal)
+    - Removes null bytes and control characters
+    - Replaces Windows-illegal characters: < > : " / \\ | ? *
+    - Limits filename length to 200 characters
+    - Handles empty or whitespace-only names
+    """
+    # Remove path components
+    filename = os.path.basename(filename)
+    
+    # Remove control characters and replace Windows-illegal characters
+    # (< > : " / \ | ? *) in one pass
+    filename = filename.translate(_SANITIZE_TABLE)
+    
+    # Limit length (255 is common max, leave room for unique suffix)
+    if len(filename) > 200:
+        name, ext = os.path.splitext(filename)
+        filename = name[:200-len(ext)] + ext
+    
+    # Handle empty or whitespace-only names
+    if not filename.strip():
+        filename = "unnamed_file"
+    
+    return filename.strip()
+
+
+class IngestionService:
+    # Chunks per embed/upsert stage in the streaming pipeline
+    PIPELINE_BATCH = 64
+
+    def __init__(self):
+        pass
+    
+    async def process_file(self, file: UploadFile, extra_metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Process an uploaded file through the ingestion pipeline.
+        """
+        try:
+            # Save file temporarily (use basename to avoid path issues)
+            file_id = str(uuid.uuid4())
+            safe_filename = sanitize_filename(file.filename)
+            file_path = os.path.join(settings.UPLOAD_DIR, safe_filename)
+            
+            # Stream to disk in 1MB chunks so peak memory is one chunk,
+            # not the whole upload; aiofiles keeps the disk writes off
+            # the event loop as well
+            async with aiofiles.open(file_path, "wb") as buffer:
+                while chunk := await file.read(1 << 20):
+                    await buffer.write(chunk)
+
+            logger.info("Saved file: %s", safe_filename)
+
+            # Extract text (in a worker process, off the event loop)
+            text, extracted_metadata = await _extract_async(file_path)
+            
+            if not text or not text.strip():
+                raise ExtractionError(f"No text could be extracted from {safe_filename}")
+            
+            # Chunk text (tokenizer-heavy, so off the event loop too)
+            chunks = await asyncio.to_thread(chunker.chunk_text, text)
+            logger.info("Created %d chunks from %s", len(chunks), safe_filename)
+            
+            # Prepare metadata
+            metadata = extra_metadata or {}
+            metadata["filename"] = safe_filename  # Use safe_filename instead of file.filename
+            metadata["file_id"] = file_id
+            metadata["upload_date"] = time.time()
+            metadata["total_chunks"] = len(chunks)
+            
+            # Embed and store chunks
+            document_id = str(uuid.uuid4())
+            
+            # Extract all chunk texts first
+            chunk_texts = []
+            for chunk_data in chunks:
+                chunk_text = chunk_data.get("text", chunk_data) if isinstance(chunk_data, dict) else chunk_data
+                chunk_texts.append(chunk_text)
+            
+            # Fold document_id into the base once, then dict(base, ...)
+            # does a single C-level copy per chunk
+            base_metadata = dict(metadata, document_id=document_id)
+
+            # Stream embed -> upsert in batches: resident vectors stay
+            # O(batch) instead of O(document), and batch i+1 embeds
+            # while batch i's upsert is still in flight
+            upsert_task = None
+            for start in range(0, len(chunk_texts), self.PIPELINE_BATCH):
+                batch_texts = chunk_texts[start:start + self.PIPELINE_BATCH]
+                vectors = await embedding_service.embed_batch_async(batch_texts)
+                metadata_list = [
+                    dict(base_metadata, text=chunk_text, chunk_index=start + i)
+                    for i, chunk_text in enumerate(batch_texts)
+                ]
+                if upsert_task is not None:
+                    await upsert_task
+                upsert_task = asyncio.ensure_future(
+                    vector_db.upsert_vectors(vectors, metadata_list)
+                )
+            if upsert_task is not None:
+                await upsert_task
+            
+            return {
+                "file_id": file_id,
+                "filename": safe_filename,  # Use safe_filename here too
+                "status": "success",
+                "chunks_count": len(chunks),
+                "document_id": document_id,
+                "message": f"Successfully processed {safe_filename}"
+            }
+            
+        except Exception as e:
+            logger.error("Error processing file %s: %s", file.filename, e)
+            raise
+
+    async def process_file_batch(self, file: UploadFile, extra_metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Process a file for batch ingestion (save, extract, chunk) but DO NOT embed or upsert.
+        Returns the chunks and metadata for batch processing by the caller.
+        """
+        try:
+            # Save file temporarily
+            file_id = str(uuid.uuid4())
+            safe_filename = sanitize_filename(file.filename)
+            file_path = os.path.join(settings.UPLOAD_DIR, safe_filename)
+            
+            # Stream to disk in 1MB chunks so peak memory is one chunk,
+            # not the whole upload; aiofiles keeps the disk writes off
+            # the event loop as well
+            async with aiofiles.open(file_path, "wb") as buffer:
+                while chunk := await file.read(1 << 20):
+                    await buffer.write(chunk)
+
+            logger.info("Saved file for batch: %s", safe_filename)
+
+            # Extract text (in a worker process, off the event loop)
+            text, extracted_metadata = await _extract_async(file_path)
+            
+            if not text or not text.strip():
+                raise ExtractionError(f"No text could be extracted from {safe_filename}")
+            
+            # Chunk text (tokenizer-heavy, so off the event loop too)
+            chunks = await asyncio.to_thread(chunker.chunk_text, text)
+            
+            # Prepare metadata
+            metadata = extra_metadata or {}
+            metadata["filename"] = safe_filename
+            metadata["file_id"] = file_id
+            metadata["upload_date"] = time.time()
+            metadata["total_chunks"] = len(chunks)
+            
+            # Prepare chunks with metadata
+            chunks_with_metadata = []
+            for i, chunk_data in enumerate(chunks):
+                chunk_text = chunk_data.get("text", chunk_data) if isinstance(chunk_data, dict) else chunk_data
+                
+                chunk_metadata = {
+                    **metadata,
+                    "text": chunk_text,
+                    "chunk_index": i
+                    # document_id will be assigned by caller
+                }
+                chunks_with_metadata.append({
+                    "text": chunk_text,
+                    "metadata": chunk_metadata
+                })
+            
+            return {
+                "filename": safe_filename,
+                "file_id": file_id,
+                "chunks": chunks_with_metadata,
+                "chunks_count": len(chunks)
+            }
+            
+        except Exception as e:
+            logger.error("Error processing file batch %s: %s", file.filename, e)
+            raise
+
+# Global instance
+ingestion_service = IngestionService()
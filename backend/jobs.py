@@ -10,6 +10,7 @@ Job Tracking Module - Manages background task status and results
 from typing import Dict, Any, Optional
 from enum import Enum
 from datetime import datetime
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,6 +35,20 @@ class JobType(str, Enum):
 _jobs: Dict[str, Dict[str, Any]] = {}
 
 
+def _serialize(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return an API-facing copy of a job with ISO timestamp strings.
+
+    Jobs store plain time.time() floats internally; formatting happens
+    here, once per read, instead of on every status tick.
+    """
+    return dict(
+        job,
+        created_at=datetime.fromtimestamp(job["created_ts"]).isoformat(),
+        updated_at=datetime.fromtimestamp(job["updated_ts"]).isoformat(),
+    )
+
+
 def create_job(job_id: str, job_type: JobType, metadata: Optional[Dict] = None) -> Dict[str, Any]:
     """
     Create a new job entry.
@@ -46,12 +61,13 @@ def create_job(job_id: str, job_type: JobType, metadata: Optional[Dict] = None)
     Returns:
         The created job dict
     """
+    now = time.time()
     job = {
         "id": job_id,
         "type": job_type.value,
         "status": JobStatus.PENDING.value,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
+        "created_ts": now,
+        "updated_ts": now,
         "progress": 0,
         "result": None,
         "error": None,
@@ -97,7 +113,7 @@ def update_job(
     if error is not None:
         job["error"] = error
     
-    job["updated_at"] = datetime.now().isoformat()
+    job["updated_ts"] = time.time()
     
     logger.info(f"Updated job {job_id}: status={job['status']}, progress={job['progress']}%")
     return job
@@ -113,7 +129,8 @@ def get_job(job_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         The job dict, or None if not found
     """
-    return _jobs.get(job_id)
+    job = _jobs.get(job_id)
+    return _serialize(job) if job else None
 
 
 def list_jobs(job_type: Optional[JobType] = None, limit: int = 50) -> list:
@@ -127,15 +144,20 @@ def list_jobs(job_type: Optional[JobType] = None, limit: int = 50) -> list:
     Returns:
         List of job dicts
     """
-    jobs = list(_jobs.values())
-    
-    if job_type:
-        jobs = [j for j in jobs if j["type"] == job_type.value]
-    
-    # Sort by created_at descending (most recent first)
-    jobs.sort(key=lambda x: x["created_at"], reverse=True)
-    
-    return jobs[:limit]
+    # Jobs are only ever appended, so the dict's insertion order is
+    # already creation order: walking it backwards yields most-recent
+    # first without sorting or timestamp comparisons, and stops as soon
+    # as limit entries are collected
+    type_value = job_type.value if job_type else None
+    jobs = []
+    for job in reversed(_jobs.values()):
+        if type_value is not None and job["type"] != type_value:
+            continue
+        jobs.append(_serialize(job))
+        if len(jobs) == limit:
+            break
+
+    return jobs
 
 
 def cleanup_old_jobs(max_age_hours: int = 24) -> int:
@@ -148,15 +170,12 @@ def cleanup_old_jobs(max_age_hours: int = 24) -> int:
     Returns:
         Number of jobs removed
     """
-    from datetime import timedelta
-    
-    cutoff = datetime.now() - timedelta(hours=max_age_hours)
-    jobs_to_remove = []
-    
-    for job_id, job in _jobs.items():
-        created_at = datetime.fromisoformat(job["created_at"])
-        if created_at < cutoff:
-            jobs_to_remove.append(job_id)
+    # Compare the stored float directly — no ISO string parsing per job
+    cutoff_ts = time.time() - max_age_hours * 3600
+    jobs_to_remove = [
+        job_id for job_id, job in _jobs.items()
+        if job["created_ts"] < cutoff_ts
+    ]
     
     for job_id in jobs_to_remove:
         del _jobs[job_id]